@@ -0,0 +1,255 @@
+import os
+import json
+import mmap
+import threading
+from bisect import bisect_left
+from array import array
+from datetime import date, timedelta
+
+class AnalyticsCache:
+    """Local columnar copy of time_entries (id, date, project, hours) for reports.
+
+    Each column is a flat binary file that is memory-mapped for reading:
+    ids ('i'), dates as day ordinals ('i'), projects as indexes into a name
+    list ('i'), hours as doubles ('d'). Rows are kept in id order. After the
+    first build the cache follows change_log: inserts are appended, edits are
+    patched in place and deletes leave a tombstone (date ordinal 0).
+    """
+    COLUMNS = {'ids': 'i', 'dates': 'i', 'projects': 'i', 'hours': 'd'}
+    # Rebuild once this share of cached rows are tombstones
+    MAX_DEAD_RATIO = 0.25
+
+    def __init__(self, db_manager, cache_dir=None):
+        self.db_manager = db_manager
+        self.cache_dir = cache_dir or os.path.join(os.path.expanduser("~"), '.timetracker', 'analytics')
+        self.meta = None
+        self.worker = None
+        self.last_result = None
+        self.last_error = None
+
+    def _path(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def _empty_meta(self):
+        return {'db_path': self.db_manager.db_path, 'change_seq': 0, 'last_id': 0, 'count': 0,
+                'dead': 0, 'projects': []}
+
+    def _load_meta(self):
+        try:
+            with open(self._path('meta.json'), 'r') as f:
+                meta = json.load(f)
+            # Caches written before change_log tracking have no change_seq
+            if meta.get('db_path') != self.db_manager.db_path or 'change_seq' not in meta:
+                return None
+            return meta
+        except (OSError, ValueError):
+            return None
+
+    def _save_meta(self):
+        tmp_path = self._path('meta.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, self._path('meta.json'))
+
+    def _reset(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for name in self.COLUMNS:
+            open(self._path(f'{name}.bin'), 'wb').close()
+        self.meta = self._empty_meta()
+
+    def _project_index(self, project, project_index):
+        if project not in project_index:
+            project_index[project] = len(self.meta['projects'])
+            self.meta['projects'].append(project)
+        return project_index[project]
+
+    def _append(self, rows, project_index):
+        """Append (id, date, project, hours) rows, which must have ids above last_id"""
+        columns = {name: array(code) for name, code in self.COLUMNS.items()}
+        for entry_id, entry_date, project, entry_hours in rows:
+            columns['ids'].append(entry_id)
+            columns['dates'].append(date.fromisoformat(entry_date).toordinal())
+            columns['projects'].append(self._project_index(project, project_index))
+            columns['hours'].append(entry_hours)
+        for name, column in columns.items():
+            with open(self._path(f'{name}.bin'), 'ab') as f:
+                column.tofile(f)
+        self.meta['last_id'] = rows[-1][0]
+        self.meta['count'] += len(rows)
+
+    def _rebuild(self):
+        self._reset()
+        # Read the seq first: changes racing the load are replayed, which is harmless
+        self.meta['change_seq'] = self.db_manager.get_change_seq()
+        rows = self.db_manager.get_entries_after(0)
+        if rows:
+            self._append(rows, {})
+
+    def _find_positions(self, entry_ids):
+        """Return {id: row position} for the given ids that are in the cache"""
+        positions = {}
+        if not self.meta['count']:
+            return positions
+        with open(self._path('ids.bin'), 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                ids = memoryview(m).cast('i')
+                try:
+                    for entry_id in entry_ids:
+                        i = bisect_left(ids, entry_id)
+                        if i < len(ids) and ids[i] == entry_id:
+                            positions[entry_id] = i
+                finally:
+                    ids.release()
+        return positions
+
+    def _apply_changes(self, changes):
+        """Patch the columns from change_log rows; returns False if a rebuild is needed"""
+        # Only the last change to each id matters; None marks a delete
+        final = {}
+        for seq, op, entry_id, old_date, project, system, hours, task, day_of_week, entry_date, notes in changes:
+            final[entry_id] = None if op == 'delete' else (entry_date, project, hours)
+
+        project_index = {name: i for i, name in enumerate(self.meta['projects'])}
+        positions = self._find_positions(final)
+        patches = []
+        appends = []
+        for entry_id, values in sorted(final.items()):
+            if entry_id in positions:
+                patches.append((positions[entry_id], values))
+            elif values is None:
+                continue  # Added and removed since the last update
+            elif entry_id > self.meta['last_id']:
+                appends.append((entry_id, *values))
+            else:
+                return False  # Not cached but below last_id; should not happen with AUTOINCREMENT
+
+        if patches:
+            files = {name: open(self._path(f'{name}.bin'), 'r+b') for name in ('dates', 'projects', 'hours')}
+            try:
+                for position, values in patches:
+                    was_dead = self._read_value(files['dates'], 'i', position) == 0
+                    if values is None:
+                        fields = {'dates': 0, 'projects': 0, 'hours': 0.0}
+                        self.meta['dead'] += not was_dead
+                    else:
+                        entry_date, project, hours = values
+                        fields = {'dates': date.fromisoformat(entry_date).toordinal(),
+                                  'projects': self._project_index(project, project_index), 'hours': hours}
+                        self.meta['dead'] -= was_dead
+                    for name, value in fields.items():
+                        code = self.COLUMNS[name]
+                        files[name].seek(position * array(code).itemsize)
+                        array(code, [value]).tofile(files[name])
+            finally:
+                for f in files.values():
+                    f.close()
+        if appends:
+            self._append(appends, project_index)
+        return True
+
+    @staticmethod
+    def _read_value(f, code, position):
+        column = array(code)
+        f.seek(position * column.itemsize)
+        column.frombytes(f.read(column.itemsize))
+        return column[0]
+
+    def update(self):
+        """Bring the cache up to date with the database; returns True if anything changed"""
+        if not self.db_manager.is_connected:
+            return False
+        if self.meta is None:
+            self.meta = self._load_meta()
+        if self.meta is None:
+            self._rebuild()
+        else:
+            # A single-row lookup when nothing has changed since the last report
+            if self.db_manager.get_change_seq() == self.meta['change_seq']:
+                return False
+            changes = self.db_manager.get_changes_since(self.meta['change_seq'])
+            if changes is None or not self._apply_changes(changes) or \
+                    self.meta['dead'] > self.MAX_DEAD_RATIO * self.meta['count']:
+                # The log was pruned past our seq, or tombstones are slowing every scan
+                self._rebuild()
+            elif changes:
+                self.meta['change_seq'] = changes[-1][0]
+        self._save_meta()
+        return True
+
+    def _scan(self, start_date, end_date):
+        """Yield (ordinal, project_idx, hours) for cached rows within the date range.
+
+        Tombstones have ordinal 0, which is outside every range.
+        """
+        if not self.meta or not self.meta['count']:
+            return
+        start = date.fromisoformat(start_date).toordinal()
+        end = date.fromisoformat(end_date).toordinal()
+
+        names = ('dates', 'projects', 'hours')
+        files = [open(self._path(f'{name}.bin'), 'rb') for name in names]
+        maps = [mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) for f in files]
+        views = [memoryview(m).cast(self.COLUMNS[name]) for m, name in zip(maps, names)]
+        try:
+            for ordinal, project_idx, hours in zip(*views):
+                if start <= ordinal <= end:
+                    yield ordinal, project_idx, hours
+        finally:
+            for view in views:
+                view.release()
+            for m in maps:
+                m.close()
+            for f in files:
+                f.close()
+
+    def hours_per_project_per_month(self, start_date, end_date):
+        """Return {(project, 'YYYY-MM'): hours} for the date range"""
+        self.update()
+        month_cache = {}
+        totals = {}
+        for ordinal, project_idx, hours in self._scan(start_date, end_date):
+            month = month_cache.get(ordinal)
+            if month is None:
+                month = month_cache[ordinal] = date.fromordinal(ordinal).strftime('%Y-%m')
+            key = (project_idx, month)
+            totals[key] = totals.get(key, 0) + hours
+        projects = self.meta['projects']
+        return {(projects[idx], month): hours for (idx, month), hours in sorted(totals.items())}
+
+    def weekly_utilization(self, start_date, end_date, target_hours=40):
+        """Return [(monday 'YYYY-MM-DD', hours, hours / target_hours)] for each week in range"""
+        self.update()
+        totals = {}
+        for ordinal, project_idx, hours in self._scan(start_date, end_date):
+            # Ordinal 1 is a Monday, so this maps every day to its week's Monday
+            monday = ordinal - (ordinal - 1) % 7
+            totals[monday] = totals.get(monday, 0) + hours
+
+        first = date.fromisoformat(start_date)
+        first -= timedelta(days=first.weekday())
+        last = date.fromisoformat(end_date).toordinal()
+        result = []
+        for monday in range(first.toordinal(), last + 1, 7):
+            hours = totals.get(monday, 0)
+            result.append((date.fromordinal(monday).strftime('%Y-%m-%d'), hours, hours / target_hours))
+        return result
+
+    def start_weekly_utilization(self, start_date, end_date, target_hours=40):
+        """Run weekly_utilization on a background thread; rows land in last_result (or last_error)"""
+        if self.is_running():
+            return False
+        self.last_result = None
+        self.last_error = None
+
+        def run():
+            try:
+                self.last_result = self.weekly_utilization(start_date, end_date, target_hours)
+            except Exception as e:
+                self.last_error = e
+
+        self.worker = threading.Thread(target=run, daemon=True)
+        self.worker.start()
+        return True
+
+    def is_running(self):
+        return self.worker is not None and self.worker.is_alive()
@@ -0,0 +1,117 @@
+import sqlite3
+import os
+import time
+import threading
+from datetime import datetime
+from database_manager import DatabaseManager
+
+class BackupManager:
+    BACKUP_PREFIX = 'timesheet_'
+    BACKUP_SUFFIX = '.db'
+
+    def __init__(self, db_manager, backup_dir=None, keep=10, pages=64, pause=0.05):
+        self.db_manager = db_manager
+        self.backup_dir = backup_dir
+        self.keep = keep        # Number of backups to retain
+        self.pages = pages      # Pages copied per backup step
+        self.pause = pause      # Seconds to sleep between steps so writers can get in
+        self.worker = None
+        self.last_result = None
+
+    def get_backup_dir(self):
+        """Return the backup folder, defaulting to 'backups' next to the database"""
+        if self.backup_dir:
+            return self.backup_dir
+        if not self.db_manager.db_path:
+            return None
+        return os.path.join(os.path.dirname(self.db_manager.db_path), 'backups')
+
+    def create_backup(self, progress=None):
+        """Copy the live database with SQLite's online backup API, in throttled steps.
+
+        Returns the path of the verified backup, or None on failure.
+        """
+        if not self.db_manager.is_connected:
+            return None
+        backup_dir = self.get_backup_dir()
+        os.makedirs(backup_dir, exist_ok=True)
+
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        target_path = os.path.join(backup_dir, f"{self.BACKUP_PREFIX}{stamp}{self.BACKUP_SUFFIX}")
+        partial_path = target_path + '.part'
+
+        def on_step(status, remaining, total):
+            if progress:
+                progress(total - remaining, total)
+            # Sleep between steps so the source lock is released for other clients
+            if remaining and self.pause:
+                time.sleep(self.pause)
+
+        target = None
+        try:
+            # Back up through the app's own connection: writes made on it during the
+            # backup are applied to the copy instead of restarting it
+            target = sqlite3.connect(partial_path)
+            self.db_manager.conn.backup(target, pages=self.pages, progress=on_step)
+            target.close()
+            target = None
+
+            if not self.verify_backup(partial_path):
+                os.remove(partial_path)
+                return None
+            os.replace(partial_path, target_path)
+            self.rotate_backups()
+            return target_path
+
+        except Exception:
+            if target:
+                target.close()
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            return None
+
+    def start_backup(self, progress=None):
+        """Run create_backup on a background thread; result lands in last_result"""
+        if self.is_running():
+            return False
+        self.last_result = None
+
+        def run():
+            self.last_result = self.create_backup(progress)
+
+        self.worker = threading.Thread(target=run, daemon=True)
+        self.worker.start()
+        return True
+
+    def is_running(self):
+        return self.worker is not None and self.worker.is_alive()
+
+    def verify_backup(self, path):
+        """Return True if the backup file passes SQLite's integrity check"""
+        try:
+            conn = DatabaseManager.connect_read_only(path)
+            try:
+                result = conn.execute('PRAGMA integrity_check').fetchone()
+            finally:
+                conn.close()
+            return result is not None and result[0] == 'ok'
+        except sqlite3.Error:
+            return False
+
+    def list_backups(self):
+        """Return existing backup paths, newest first"""
+        backup_dir = self.get_backup_dir()
+        if not backup_dir or not os.path.isdir(backup_dir):
+            return []
+        names = [name for name in os.listdir(backup_dir)
+                 if name.startswith(self.BACKUP_PREFIX) and name.endswith(self.BACKUP_SUFFIX)]
+        # Timestamped names sort chronologically
+        return [os.path.join(backup_dir, name) for name in sorted(names, reverse=True)]
+
+    def rotate_backups(self):
+        """Delete the oldest backups beyond the retention count"""
+        for path in self.list_backups()[self.keep:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
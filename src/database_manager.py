@@ -2,10 +2,27 @@ import sqlite3
 from datetime import datetime
 import os
 import json
+import zlib
+import getpass
+from urllib.request import pathname2url
 
 class DatabaseManager:
-    def __init__(self):
+    # Editable columns of time_entries
+    ENTRY_COLUMNS = ('date', 'day_of_week', 'project', 'system', 'hours', 'task', 'notes')
+    # Rows kept in change_log; clients further behind than this do a full reload
+    CHANGE_LOG_KEEP = 5000
+    # Copy-week and template rows (aliased s) are skipped when the target day
+    # already has an entry for the same project, system and task
+    NOT_IN_TARGET = '''NOT EXISTS (
+        SELECT 1 FROM time_entries t
+        WHERE t.date = s.date AND t.project = s.project AND t.system = s.system AND t.task = s.task
+    )'''
+
+    def __init__(self, db_path=None):
         self.load_config()
+        if db_path:
+            # Explicit path, e.g. for the benchmark scripts; config.json is left alone
+            self.db_path = db_path
         self.conn = None
         self.is_connected = False
         self.try_connect()
@@ -45,8 +62,8 @@ class DatabaseManager:
                 self.is_connected = False
                 return False
             
-            # Create new connection
-            self.conn = sqlite3.connect(self.db_path)
+            # Create new connection (shared with the background backup thread)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
             
             # Create tables immediately after successful connection
             cursor = self.conn.cursor()
@@ -69,8 +86,30 @@ class DatabaseManager:
             columns = [column[1] for column in cursor.fetchall()]
             if 'notes' not in columns:
                 cursor.execute('ALTER TABLE time_entries ADD COLUMN notes TEXT')
+
+            # Week views and date-sharded reports all filter on date
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_time_entries_date ON time_entries(date)')
+
+            self._create_close_out_tables(cursor)
+            self._create_change_log(cursor)
+
+            # Saved week templates; day_index is 0 for Monday through 6 for Sunday
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS entry_templates (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    day_index INTEGER NOT NULL,
+                    day_of_week TEXT NOT NULL,
+                    project TEXT NOT NULL,
+                    system TEXT NOT NULL,
+                    hours REAL NOT NULL,
+                    task TEXT NOT NULL,
+                    notes TEXT
+                )
+            ''')
             
             self.conn.commit()
+            self._create_edit_journal()
             self.is_connected = True
             return True
             
@@ -81,6 +120,202 @@ class DatabaseManager:
             self.is_connected = False
             return False
 
+    def _create_close_out_tables(self, cursor):
+        """Closed weeks, their snapshots and audit trail, plus triggers that freeze closed weeks"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS closed_weeks (
+                week_start TEXT PRIMARY KEY,
+                closed_at TEXT NOT NULL,
+                closed_by TEXT NOT NULL,
+                snapshot TEXT NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS week_audit (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                week_start TEXT NOT NULL,
+                action TEXT NOT NULL,
+                user TEXT NOT NULL,
+                reason TEXT,
+                at TEXT NOT NULL
+            )
+        ''')
+        # date(x, '-6 days', 'weekday 1') is the Monday of x's week. Writers use
+        # 'with self.conn' so a rejected statement rolls back and releases the lock
+        for name, timing, rows in (('insert', 'INSERT', ('NEW',)),
+                                   ('update', 'UPDATE', ('OLD', 'NEW')),
+                                   ('delete', 'DELETE', ('OLD',))):
+            weeks = ', '.join(f"date({row}.date, '-6 days', 'weekday 1')" for row in rows)
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS closed_week_no_{name}
+                BEFORE {timing} ON time_entries
+                WHEN EXISTS (SELECT 1 FROM closed_weeks WHERE week_start IN ({weeks}))
+                BEGIN
+                    SELECT RAISE(ABORT, 'week is closed');
+                END
+            ''')
+
+    def _create_change_log(self, cursor):
+        """Sequence-numbered log of every time_entries change, written by triggers"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS change_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                op TEXT NOT NULL,
+                entry_id INTEGER NOT NULL,
+                old_date TEXT,
+                project TEXT,
+                system TEXT,
+                hours REAL,
+                task TEXT,
+                day_of_week TEXT,
+                date TEXT,
+                notes TEXT
+            )
+        ''')
+        new_values = 'NEW.project, NEW.system, NEW.hours, NEW.task, NEW.day_of_week, NEW.date, NEW.notes'
+        for name, timing, old_date, values in (('insert', 'INSERT', 'NULL', new_values),
+                                               ('update', 'UPDATE', 'OLD.date', new_values),
+                                               ('delete', 'DELETE', 'OLD.date', 'NULL, NULL, NULL, NULL, NULL, NULL, NULL')):
+            row = 'OLD' if name == 'delete' else 'NEW'
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS change_log_{name}
+                AFTER {timing} ON time_entries
+                BEGIN
+                    INSERT INTO change_log (op, entry_id, old_date, project, system, hours,
+                                            task, day_of_week, date, notes)
+                    VALUES ('{name}', {row}.id, {old_date}, {values});
+                END
+            ''')
+        cursor.execute('''
+            DELETE FROM change_log WHERE seq <= (SELECT MAX(seq) FROM change_log) - ?
+        ''', (self.CHANGE_LOG_KEEP,))
+
+    def _create_edit_journal(self):
+        """Permanent journal of entry edits plus per-week snapshots for time-travel queries"""
+        if not self._journal_exists():
+            self._create_journal_tables()
+
+        # The journal triggers are persistent so every writer is recorded, but they
+        # cannot know who is writing. This per-connection TEMP trigger stamps our
+        # user name; rows from other tools and older app versions keep user NULL
+        user = getpass.getuser().replace("'", "''")
+        self.conn.execute(f'''
+            CREATE TEMP TRIGGER IF NOT EXISTS entry_journal_stamp_user
+            AFTER INSERT ON main.entry_journal WHEN NEW.user IS NULL
+            BEGIN
+                UPDATE entry_journal SET user = '{user}' WHERE seq = NEW.seq;
+            END
+        ''')
+
+    def _journal_exists(self):
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='entry_journal_insert'").fetchone() is not None
+
+    def _create_journal_tables(self):
+        with self.conn:
+            self.conn.execute('BEGIN IMMEDIATE')
+            # Another client may have created it while we waited for the lock
+            if self._journal_exists():
+                return
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS entry_journal (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    at TEXT NOT NULL,
+                    user TEXT,
+                    op TEXT NOT NULL,
+                    entry_id INTEGER NOT NULL,
+                    week_start TEXT,
+                    old_week_start TEXT,
+                    data TEXT
+                )
+            ''')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_entry_journal_week ON entry_journal(week_start, seq)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_entry_journal_old_week ON entry_journal(old_week_start, seq)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_entry_journal_at ON entry_journal(at)')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS journal_snapshots (
+                    week_start TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    taken_at TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    PRIMARY KEY (week_start, seq)
+                )
+            ''')
+            # Journal events per week since that week's last snapshot
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS journal_weeks (
+                    week_start TEXT PRIMARY KEY,
+                    pending INTEGER NOT NULL
+                )
+            ''')
+
+            week = "date({row}.date, '-6 days', 'weekday 1')"
+            new_week, old_week = week.format(row='NEW'), week.format(row='OLD')
+            all_fields = ', '.join(f"'{name}', NEW.{name}" for name in self.ENTRY_COLUMNS)
+            date_moved = 'OLD.date IS NOT NEW.date'
+            changed_fields = ' UNION ALL '.join(
+                f"SELECT '{name}' AS k, NEW.{name} AS v WHERE OLD.{name} IS NOT NEW.{name} OR {date_moved}"
+                for name in self.ENTRY_COLUMNS)
+            any_changed = ' OR '.join(f"OLD.{name} IS NOT NEW.{name}" for name in self.ENTRY_COLUMNS)
+            count_week = '''
+                INSERT INTO journal_weeks (week_start, pending) SELECT {week}, 1 WHERE {condition}
+                ON CONFLICT (week_start) DO UPDATE SET pending = pending + 1;
+            '''
+            triggers = {
+                'INSERT': ('', f"'insert', NEW.id, {new_week}, NULL, json_object({all_fields})",
+                           count_week.format(week=new_week, condition=1)),
+                # Updates keep only the changed columns, or the whole row when it moves to another date
+                'UPDATE': (f'WHEN {any_changed}',
+                           f"'update', NEW.id, {new_week}, {old_week}, "
+                           f"(SELECT json_group_object(k, v) FROM ({changed_fields}))",
+                           count_week.format(week=new_week, condition=1) +
+                           count_week.format(week=old_week, condition=f'{old_week} IS NOT {new_week}')),
+                'DELETE': ('', f"'delete', OLD.id, NULL, {old_week}, NULL",
+                           count_week.format(week=old_week, condition=1)),
+            }
+            for timing, (when, values, counts) in triggers.items():
+                self.conn.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS entry_journal_{timing.lower()}
+                    AFTER {timing} ON time_entries {when}
+                    BEGIN
+                        INSERT INTO entry_journal (at, user, op, entry_id, week_start, old_week_start, data)
+                        VALUES (datetime('now', 'localtime'), NULL, {values});
+                        {counts}
+                    END
+                ''')
+
+            # Start marker: nothing is known about edits before it
+            cursor = self.conn.execute('''
+                INSERT INTO entry_journal (at, user, op, entry_id)
+                VALUES (datetime('now', 'localtime'), ?, 'start', 0)
+            ''', (getpass.getuser(),))
+            start_seq = cursor.lastrowid
+
+            # Baseline: every week's rows as of the start marker, so replay has a starting point
+            weeks = {}
+            for row in self.conn.execute('''
+                SELECT date(date, '-6 days', 'weekday 1'), id, project, system, hours, task,
+                       day_of_week, date, COALESCE(notes, '')
+                FROM time_entries
+            '''):
+                weeks.setdefault(row[0], []).append(row[1:])
+            for week_start, rows in weeks.items():
+                self._insert_journal_snapshot(week_start, start_seq, rows)
+            self.conn.execute('UPDATE journal_weeks SET pending = 0')
+
+    def _insert_journal_snapshot(self, week_start, seq, rows):
+        data = zlib.compress(json.dumps(rows, separators=(',', ':')).encode('utf-8'))
+        self.conn.execute('''
+            INSERT OR REPLACE INTO journal_snapshots (week_start, seq, taken_at, data)
+            VALUES (?, ?, ?, ?)
+        ''', (week_start, seq, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), data))
+
+    @staticmethod
+    def connect_read_only(db_path):
+        """Open a read-only connection to db_path, e.g. for report workers"""
+        uri = 'file:' + pathname2url(os.path.abspath(db_path)) + '?mode=ro'
+        return sqlite3.connect(uri, uri=True)
+
     def create_tables(self):
         """Removed as table creation is now handled in try_connect"""
         pass
@@ -89,16 +324,17 @@ class DatabaseManager:
         if not self.is_connected:
             return False
         cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT INTO time_entries (date, day_of_week, project, system, hours, task, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (date, day_of_week, project, system, hours, task, notes))
-        self.conn.commit()
+        with self.conn:
+            cursor.execute('''
+                INSERT INTO time_entries (date, day_of_week, project, system, hours, task, notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (date, day_of_week, project, system, hours, task, notes))
 
-    def get_entries_for_week(self, start_date, end_date):
+    def get_entries_for_week(self, start_date, end_date, row_factory=None):
         if not self.is_connected:
             return []
         cursor = self.conn.cursor()
+        cursor.row_factory = row_factory
         cursor.execute('''
             SELECT id, project, system, hours, task, day_of_week, date,
                    COALESCE(notes, '') as notes
@@ -120,20 +356,368 @@ class DatabaseManager:
         ''', (start_date, end_date))
         return cursor.fetchall()
 
+    def get_daily_totals(self, start_date, end_date):
+        """Return (date, total hours) for each day with entries in the range"""
+        if not self.is_connected:
+            return []
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT date, SUM(hours)
+            FROM time_entries
+            WHERE date BETWEEN ? AND ?
+            GROUP BY date
+        ''', (start_date, end_date))
+        return cursor.fetchall()
+
+    def get_change_seq(self):
+        """Return the latest change_log sequence number"""
+        if not self.is_connected:
+            return 0
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name='change_log'")
+        row = cursor.fetchone()
+        return row[0] if row else 0
+
+    def get_changes_since(self, seq):
+        """Return change_log rows after seq, oldest first.
+
+        Rows are (seq, op, entry_id, old_date, project, system, hours, task,
+        day_of_week, date, notes). Returns None if the log has been pruned past
+        seq, in which case the caller should reload in full.
+        """
+        if not self.is_connected:
+            return []
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT seq, op, entry_id, old_date, project, system, hours, task, day_of_week, date, notes
+            FROM change_log
+            WHERE seq > ?
+            ORDER BY seq
+        ''', (seq,))
+        changes = cursor.fetchall()
+        if changes and changes[0][0] != seq + 1:
+            # A gap means either pruned history or a rolled-back insert; check which
+            cursor.execute('SELECT MIN(seq) FROM change_log')
+            if cursor.fetchone()[0] > seq + 1:
+                return None
+        return changes
+
+    def get_entries_after(self, last_id):
+        """Return (id, date, project, hours) for rows added after last_id"""
+        if not self.is_connected:
+            return []
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT id, date, project, hours
+            FROM time_entries
+            WHERE id > ?
+            ORDER BY id
+        ''', (last_id,))
+        return cursor.fetchall()
+
     def update_entry(self, entry_id, date, day_of_week, project, system, hours, task, notes=""):
         if not self.is_connected:
             return False
         cursor = self.conn.cursor()
-        cursor.execute('''
-            UPDATE time_entries
-            SET date=?, day_of_week=?, project=?, system=?, hours=?, task=?, notes=?
-            WHERE id=?
-        ''', (date, day_of_week, project, system, hours, task, notes, entry_id))
-        self.conn.commit()
+        with self.conn:
+            cursor.execute('''
+                UPDATE time_entries
+                SET date=?, day_of_week=?, project=?, system=?, hours=?, task=?, notes=?
+                WHERE id=?
+            ''', (date, day_of_week, project, system, hours, task, notes, entry_id))
+
+    def update_entry_fields(self, entry_id, fields):
+        """Update only the given columns of an entry"""
+        if not self.is_connected:
+            return False
+        columns = [name for name in fields if name in self.ENTRY_COLUMNS]
+        if not columns:
+            return False
+        cursor = self.conn.cursor()
+        assignments = ', '.join(f"{name}=?" for name in columns)
+        with self.conn:
+            cursor.execute(f'UPDATE time_entries SET {assignments} WHERE id=?',
+                           [fields[name] for name in columns] + [entry_id])
+        return True
 
     def delete_entry(self, entry_id):
         if not self.is_connected:
             return False
         cursor = self.conn.cursor()
-        cursor.execute('DELETE FROM time_entries WHERE id=?', (entry_id,))
-        self.conn.commit()
+        with self.conn:
+            cursor.execute('DELETE FROM time_entries WHERE id=?', (entry_id,))
+
+    def apply_entry_changes(self, inserts, updates, deletes):
+        """Write a batch of edits in one transaction.
+
+        inserts are (date, day_of_week, project, system, hours, task, notes),
+        updates are (hours, entry_id) and deletes are entry ids.
+        """
+        if not self.is_connected:
+            return False
+        cursor = self.conn.cursor()
+        with self.conn:
+            cursor.executemany('''
+                INSERT INTO time_entries (date, day_of_week, project, system, hours, task, notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', inserts)
+            cursor.executemany('UPDATE time_entries SET hours=? WHERE id=?', updates)
+            cursor.executemany('DELETE FROM time_entries WHERE id=?', [(entry_id,) for entry_id in deletes])
+        return True
+
+    def _copy_week_rows(self):
+        """SELECT of a week's rows shifted to the target week, minus rows already there"""
+        return f'''
+            SELECT s.date, s.day_of_week, s.project, s.system, s.hours, s.task, s.notes
+            FROM (SELECT id, date(date, printf('%+d days', CAST(julianday(?) - julianday(?) AS INTEGER))) AS date,
+                         day_of_week, project, system, hours, task, notes
+                  FROM time_entries
+                  WHERE date BETWEEN ? AND ?) s
+            WHERE {self.NOT_IN_TARGET}
+            ORDER BY s.date, s.id
+        '''
+
+    def preview_copy_week(self, source_start, source_end, target_start):
+        """Return the rows copy_week would insert, as (project, system, hours, task, day, date, notes)"""
+        if not self.is_connected:
+            return []
+        cursor = self.conn.cursor()
+        cursor.execute(f'''
+            SELECT project, system, hours, task, day_of_week, date, COALESCE(notes, '')
+            FROM ({self._copy_week_rows()})
+        ''', (target_start, source_start, source_start, source_end))
+        return cursor.fetchall()
+
+    def copy_week(self, source_start, source_end, target_start):
+        """Copy a week's entries to the week starting at target_start in one statement.
+
+        Rows whose day already has an entry for the same project, system and
+        task are skipped, so copying twice does not duplicate anything.
+        """
+        if not self.is_connected:
+            return 0
+        cursor = self.conn.cursor()
+        with self.conn:
+            cursor.execute(f'''
+                INSERT INTO time_entries (date, day_of_week, project, system, hours, task, notes)
+                {self._copy_week_rows()}
+            ''', (target_start, source_start, source_start, source_end))
+        return cursor.rowcount
+
+    def save_template(self, name, start_date, end_date):
+        """Save a week's entries as a named template, replacing any template with that name.
+
+        An empty week saves nothing and leaves an existing template untouched.
+        """
+        if not self.is_connected:
+            return 0
+        cursor = self.conn.cursor()
+        with self.conn:
+            cursor.execute('DELETE FROM entry_templates WHERE name=?', (name,))
+            cursor.execute('''
+                INSERT INTO entry_templates (name, day_index, day_of_week, project, system, hours, task, notes)
+                SELECT ?, (CAST(strftime('%w', date) AS INTEGER) + 6) % 7,
+                       day_of_week, project, system, hours, task, notes
+                FROM time_entries
+                WHERE date BETWEEN ? AND ?
+                ORDER BY date, id
+            ''', (name, start_date, end_date))
+            count = cursor.rowcount
+            if not count:
+                self.conn.rollback()
+        return count
+
+    def get_template_names(self):
+        if not self.is_connected:
+            return []
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT DISTINCT name FROM entry_templates ORDER BY name')
+        return [row[0] for row in cursor.fetchall()]
+
+    def _template_rows(self):
+        """SELECT of a template's rows dated into the target week, minus rows already there"""
+        return f'''
+            SELECT s.date, s.day_of_week, s.project, s.system, s.hours, s.task, s.notes
+            FROM (SELECT id, day_index, date(?, '+' || day_index || ' days') AS date,
+                         day_of_week, project, system, hours, task, notes
+                  FROM entry_templates
+                  WHERE name=?) s
+            WHERE {self.NOT_IN_TARGET}
+            ORDER BY s.day_index, s.id
+        '''
+
+    def preview_template(self, name, week_start):
+        """Return the rows apply_template would insert, as (project, system, hours, task, day, date, notes)"""
+        if not self.is_connected:
+            return []
+        cursor = self.conn.cursor()
+        cursor.execute(f'''
+            SELECT project, system, hours, task, day_of_week, date, COALESCE(notes, '')
+            FROM ({self._template_rows()})
+        ''', (week_start, name))
+        return cursor.fetchall()
+
+    def apply_template(self, name, week_start):
+        """Insert a template's entries into the week starting at week_start in one statement.
+
+        Like copy_week, rows already present in the target week are skipped.
+        """
+        if not self.is_connected:
+            return 0
+        cursor = self.conn.cursor()
+        with self.conn:
+            cursor.execute(f'''
+                INSERT INTO time_entries (date, day_of_week, project, system, hours, task, notes)
+                {self._template_rows()}
+            ''', (week_start, name))
+        return cursor.rowcount
+
+    def delete_template(self, name):
+        if not self.is_connected:
+            return False
+        cursor = self.conn.cursor()
+        with self.conn:
+            cursor.execute('DELETE FROM entry_templates WHERE name=?', (name,))
+        return True
+
+    def count_entries(self, start_date, end_date):
+        if not self.is_connected:
+            return 0
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM time_entries WHERE date BETWEEN ? AND ?', (start_date, end_date))
+        return cursor.fetchone()[0]
+
+    def get_closed_weeks(self):
+        """Return {week_start: closed_at} for every closed week"""
+        if not self.is_connected:
+            return {}
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT week_start, closed_at FROM closed_weeks')
+        return dict(cursor.fetchall())
+
+    def get_close_out_version(self):
+        """Return a number that changes whenever any week is closed or reopened"""
+        if not self.is_connected:
+            return 0
+        cursor = self.conn.cursor()
+        # Every close and reopen adds a week_audit row, so its AUTOINCREMENT counter is the version
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name='week_audit'")
+        row = cursor.fetchone()
+        return row[0] if row else 0
+
+    def get_week_snapshot(self, week_start):
+        """Return (closed_at, snapshot JSON) for a closed week, or None"""
+        if not self.is_connected:
+            return None
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT closed_at, snapshot FROM closed_weeks WHERE week_start=?', (week_start,))
+        return cursor.fetchone()
+
+    def close_week(self, week_start, week_end, user):
+        """Freeze a week and store its snapshot; returns (closed_at, snapshot JSON)"""
+        if not self.is_connected:
+            return None
+        closed_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self.conn:
+            # Read the rows inside the same transaction that closes the week
+            self.conn.execute('BEGIN IMMEDIATE')
+            entries = self.get_entries_for_week(week_start, week_end)
+            summary = self.get_weekly_summary(week_start, week_end)
+            snapshot = json.dumps({'week_start': week_start, 'closed_at': closed_at,
+                                   'entries': entries, 'summary': summary},
+                                  separators=(',', ':'))
+            self.conn.execute('''
+                INSERT INTO closed_weeks (week_start, closed_at, closed_by, snapshot)
+                VALUES (?, ?, ?, ?)
+            ''', (week_start, closed_at, user, snapshot))
+            self.conn.execute('''
+                INSERT INTO week_audit (week_start, action, user, at) VALUES (?, 'close', ?, ?)
+            ''', (week_start, user, closed_at))
+        return closed_at, snapshot
+
+    def reopen_week(self, week_start, user, reason):
+        """Unfreeze a closed week, recording who reopened it and why"""
+        if not self.is_connected:
+            return False
+        with self.conn:
+            cursor = self.conn.execute('DELETE FROM closed_weeks WHERE week_start=?', (week_start,))
+            if cursor.rowcount:
+                self.conn.execute('''
+                    INSERT INTO week_audit (week_start, action, user, reason, at) VALUES (?, 'reopen', ?, ?, ?)
+                ''', (week_start, user, reason, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        return bool(cursor.rowcount)
+
+    def get_journal_seq_at(self, timestamp):
+        """Return the last journal seq recorded at or before 'YYYY-MM-DD HH:MM:SS'"""
+        if not self.is_connected:
+            return 0
+        cursor = self.conn.cursor()
+        # Walks idx_entry_journal_at backwards from the timestamp, so it stays fast as the journal grows
+        cursor.execute('''
+            SELECT seq FROM entry_journal WHERE at <= ? ORDER BY at DESC, seq DESC LIMIT 1
+        ''', (timestamp,))
+        row = cursor.fetchone()
+        return row[0] if row else 0
+
+    def get_journal_start(self):
+        """Return (seq, at) of the journal's start marker, or None"""
+        if not self.is_connected:
+            return None
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT seq, at FROM entry_journal WHERE op='start' ORDER BY seq LIMIT 1")
+        return cursor.fetchone()
+
+    def get_journal_snapshot(self, week_start, max_seq):
+        """Return (seq, rows) of the newest snapshot of a week taken at or before max_seq"""
+        if not self.is_connected:
+            return (0, [])
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT seq, data FROM journal_snapshots
+            WHERE week_start=? AND seq <= ?
+            ORDER BY seq DESC LIMIT 1
+        ''', (week_start, max_seq))
+        row = cursor.fetchone()
+        if row is None:
+            # No snapshot means the week was empty when the journal started
+            return (0, [])
+        return row[0], json.loads(zlib.decompress(row[1]).decode('utf-8'))
+
+    def get_journal_events(self, week_start, after_seq, max_seq=None):
+        """Return (seq, at, user, op, entry_id, data) touching a week, within (after_seq, max_seq]"""
+        if not self.is_connected:
+            return []
+        if max_seq is None:
+            max_seq = self.conn.execute('SELECT COALESCE(MAX(seq), 0) FROM entry_journal').fetchone()[0]
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT seq, at, user, op, entry_id, data FROM entry_journal
+            WHERE week_start=? AND seq > ? AND seq <= ?
+            UNION
+            SELECT seq, at, user, op, entry_id, data FROM entry_journal
+            WHERE old_week_start=? AND seq > ? AND seq <= ?
+            ORDER BY seq
+        ''', (week_start, after_seq, max_seq, week_start, after_seq, max_seq))
+        return cursor.fetchall()
+
+    def get_weeks_due_for_snapshot(self, min_events):
+        """Return weeks with at least min_events journal events since their last snapshot"""
+        if not self.is_connected:
+            return []
+        cursor = self.conn.cursor()
+        # journal_weeks has one row per week, kept up to date by the journal triggers
+        cursor.execute('SELECT week_start FROM journal_weeks WHERE pending >= ?', (min_events,))
+        return [row[0] for row in cursor.fetchall()]
+
+    def snapshot_week(self, week_start, week_end):
+        """Store the week's current rows as a snapshot at the current journal seq"""
+        if not self.is_connected:
+            return False
+        with self.conn:
+            # Hold the write lock so the rows and seq describe the same moment
+            self.conn.execute('BEGIN IMMEDIATE')
+            seq = self.conn.execute('SELECT COALESCE(MAX(seq), 0) FROM entry_journal').fetchone()[0]
+            rows = self.get_entries_for_week(week_start, week_end)
+            self._insert_journal_snapshot(week_start, seq, rows)
+            self.conn.execute('UPDATE journal_weeks SET pending = 0 WHERE week_start=?', (week_start,))
+        return True
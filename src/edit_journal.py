@@ -0,0 +1,75 @@
+import json
+from datetime import datetime, timedelta
+
+from entry_repository import TimeEntry
+
+class EditJournal:
+    """Time-travel queries over the entry_journal table.
+
+    Triggers append an event for every insert, update and delete. A week's
+    state at some moment is rebuilt from its newest snapshot before that
+    moment plus the events recorded after it, so a query only replays the
+    tail rather than the week's whole history.
+    """
+    SNAPSHOT_EVERY = 50  # Events on a week before it gets a new snapshot
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    @staticmethod
+    def _week_end(week_start):
+        return (datetime.strptime(week_start, '%Y-%m-%d') + timedelta(days=6)).strftime('%Y-%m-%d')
+
+    def journal_start(self):
+        """Return when the journal started recording ('YYYY-MM-DD HH:MM:SS'), or None"""
+        start = self.db_manager.get_journal_start()
+        return start[1] if start else None
+
+    def week_as_of(self, week_start, as_of):
+        """Return the week's entries as they were at 'YYYY-MM-DD HH:MM:SS', in date order.
+
+        Returns None if as_of is before the journal started, since nothing is
+        known about the week at that time.
+        """
+        week_end = self._week_end(week_start)
+        start = self.db_manager.get_journal_start()
+        target_seq = self.db_manager.get_journal_seq_at(as_of)
+        if start is None or target_seq < start[0]:
+            return None
+        snapshot_seq, rows = self.db_manager.get_journal_snapshot(week_start, target_seq)
+        state = {row[0]: dict(zip(TimeEntry.__slots__, row)) for row in rows}
+
+        for seq, at, user, op, entry_id, data in self.db_manager.get_journal_events(
+                week_start, snapshot_seq, target_seq):
+            fields = json.loads(data) if data else {}
+            if op == 'delete':
+                state.pop(entry_id, None)
+                continue
+            if entry_id in state:
+                state[entry_id].update(fields)
+            elif 'date' in fields:
+                # An insert, or an update that moved the entry in with its full row
+                state[entry_id] = dict(fields, id=entry_id)
+            else:
+                continue
+            if not week_start <= state[entry_id]['date'] <= week_end:
+                del state[entry_id]
+
+        entries = [TimeEntry(**{field: values.get(field, '') for field in TimeEntry.__slots__})
+                   for values in state.values()]
+        for entry in entries:
+            entry.notes = entry.notes or ''
+        return sorted(entries, key=lambda entry: (entry.date, entry.id))
+
+    def get_week_history(self, week_start):
+        """Return (at, user, op, entry_id, data) for every change to a week, oldest first"""
+        events = self.db_manager.get_journal_events(week_start, 0)
+        return [(at, user, op, entry_id, json.loads(data) if data else {})
+                for seq, at, user, op, entry_id, data in events]
+
+    def take_due_snapshots(self):
+        """Snapshot every week with SNAPSHOT_EVERY or more events since its last snapshot"""
+        weeks = self.db_manager.get_weeks_due_for_snapshot(self.SNAPSHOT_EVERY)
+        for week_start in weeks:
+            self.db_manager.snapshot_week(week_start, self._week_end(week_start))
+        return len(weeks)
@@ -0,0 +1,77 @@
+class TimeEntry:
+    __slots__ = ('id', 'project', 'system', 'hours', 'task', 'day_of_week', 'date', 'notes')
+
+    # Fields in the order the entries table displays them
+    DISPLAY_FIELDS = ('project', 'system', 'hours', 'task', 'day_of_week', 'date', 'notes')
+
+    def __init__(self, id, project, system, hours, task, day_of_week, date, notes=''):
+        self.id = id
+        self.project = project
+        self.system = system
+        self.hours = hours
+        self.task = task
+        self.day_of_week = day_of_week
+        self.date = date
+        self.notes = notes
+
+    @classmethod
+    def from_row(cls, cursor, row):
+        """sqlite3 row factory for queries selecting columns in __slots__ order"""
+        return cls(*row)
+
+    def display_values(self):
+        return tuple(getattr(self, field) for field in self.DISPLAY_FIELDS)
+
+    def __repr__(self):
+        return f"TimeEntry({self.id}, {self.date}, {self.project!r}, {self.hours})"
+
+
+class EntryRepository:
+    """In-memory model of the loaded week's entries, indexed by id"""
+
+    def __init__(self, db_manager, snapshot_store=None):
+        self.db_manager = db_manager
+        self.snapshot_store = snapshot_store
+        self.entries = {}
+
+    def load_week(self, start_date, end_date):
+        """Load a week's entries, replacing the current model; returns them in date order.
+
+        Closed weeks are read from their snapshot instead of the database.
+        """
+        snapshot = self.snapshot_store.get(start_date) if self.snapshot_store else None
+        if snapshot is not None:
+            rows = [TimeEntry(*row) for row in snapshot['entries']]
+        else:
+            rows = self.db_manager.get_entries_for_week(start_date, end_date, row_factory=TimeEntry.from_row)
+        self.entries = {entry.id: entry for entry in rows}
+        return rows
+
+    def get(self, entry_id):
+        return self.entries.get(entry_id)
+
+    def put(self, entry):
+        """Add or replace an entry in the model only, e.g. from a change_log delta"""
+        self.entries[entry.id] = entry
+
+    def forget(self, entry_id):
+        """Drop an entry from the model only"""
+        self.entries.pop(entry_id, None)
+
+    def update_fields(self, entry_id, changes):
+        """Apply changed fields to the model and write only those columns"""
+        entry = self.entries.get(entry_id)
+        if entry is None:
+            return False
+        changes = {field: value for field, value in changes.items() if getattr(entry, field) != value}
+        if not changes:
+            return True
+        # Write first so the model is untouched if the database rejects the change
+        self.db_manager.update_entry_fields(entry_id, changes)
+        for field, value in changes.items():
+            setattr(entry, field, value)
+        return True
+
+    def delete(self, entry_id):
+        self.db_manager.delete_entry(entry_id)
+        self.entries.pop(entry_id, None)
@@ -1,16 +1,40 @@
 import os
+import sqlite3
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 from tkinter import filedialog
+from tkinter import simpledialog
 import tkinter.font as tkFont  # Import tkinter.font
+from datetime import datetime, timedelta
+from backup_manager import BackupManager
+from analytics_cache import AnalyticsCache
+from entry_repository import EntryRepository, TimeEntry
+from report_builder import ReportBuilder
+from week_heatmap import WeekHeatmap
+from snapshot_store import SnapshotStore
+from timer_manager import TimerManager
+from week_grid import WeekGridEditor
+from edit_journal import EditJournal
 
 class TimeTrackerGUI:
+    CHANGE_POLL_MS = 5000  # How often to check change_log for other users' edits
+
     def __init__(self, db_manager, date_utils):
         self.root = tk.Tk()
         self.root.title("Time Tracker")
         self.db_manager = db_manager
         self.date_utils = date_utils
+        self.backup_manager = BackupManager(db_manager)
+        self.analytics_cache = AnalyticsCache(db_manager)
+        self.snapshot_store = SnapshotStore(db_manager)
+        self.entry_repo = EntryRepository(db_manager, self.snapshot_store)
+        self.timer_manager = TimerManager()
+        self.edit_journal = EditJournal(db_manager)
+        self.change_seq = 0
+        self.summary_tree = None
+        self.summary_week_start = None
+        self.report_builder = ReportBuilder(db_manager)
         
         # Add font scaling with reliable default font size
         self.current_scale = 1.0
@@ -55,6 +79,7 @@ class TimeTrackerGUI:
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Change DB location", command=self.configure_database)
+        file_menu.add_command(label="Back up database", command=self.backup_database)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
 
@@ -63,6 +88,23 @@ class TimeTrackerGUI:
         menubar.add_cascade(label="View", menu=view_menu)
         view_menu.add_command(label="Zoom In", command=lambda: self.change_font_scale(1.2))
         view_menu.add_command(label="Zoom Out", command=lambda: self.change_font_scale(1/1.2))
+        view_menu.add_separator()
+        view_menu.add_command(label="Weekly utilization", command=self.show_utilization)
+        view_menu.add_command(label="Year report", command=self.show_year_report)
+
+        # Week menu
+        week_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Week", menu=week_menu)
+        week_menu.add_command(label="Edit selected week as grid...", command=self.show_week_grid)
+        week_menu.add_command(label="Copy selected week to current week", command=self.copy_week_to_current)
+        week_menu.add_command(label="Save selected week as template...", command=self.save_week_template)
+        week_menu.add_command(label="Apply template to selected week...", command=self.apply_week_template)
+        week_menu.add_separator()
+        week_menu.add_command(label="Close selected week", command=self.close_selected_week)
+        week_menu.add_command(label="Reopen selected week...", command=self.reopen_selected_week)
+        week_menu.add_separator()
+        week_menu.add_command(label="Show selected week as of...", command=self.show_week_as_of)
+        week_menu.add_command(label="Change history of selected week", command=self.show_week_history)
         
         # Remove scale button code and continue with rest of setup
         frame = ttk.Frame(self.root, padding="10")
@@ -79,9 +121,13 @@ class TimeTrackerGUI:
         # Entry form section
         self._setup_entry_form(frame)
 
+        # Stopwatch timers section
+        self._setup_timer_panel(frame)
+
         # Initial setup
         self.refresh_entries()
         self.entries['project'].focus_set()
+        self.root.after(self.CHANGE_POLL_MS, self._poll_changes_loop)
 
     def _setup_week_selector(self, frame):
         ttk.Label(frame, text="Select week:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
@@ -92,6 +138,11 @@ class TimeTrackerGUI:
         week_combo.set(weeks[0])
         week_combo.bind('<<ComboboxSelected>>', self.on_week_selected)
 
+        # Hours overview of all selectable weeks; clicking a week selects it
+        self.heatmap = WeekHeatmap(frame, self.db_manager, self.date_utils,
+                                   on_week_click=self.select_week)
+        self.heatmap.grid(row=0, column=1, rowspan=3, padx=5, pady=5, sticky=tk.W)
+
         self.status_label = ttk.Label(frame, text="", foreground="red")
         self.status_label.grid(row=2, column=0, pady=5, sticky=tk.W, padx=5)
 
@@ -146,6 +197,31 @@ class TimeTrackerGUI:
         ttk.Button(frame, text="Show weekly summary",
                   command=self.show_summary).grid(row=5, column=0, pady=5, sticky=tk.W, padx=5)
 
+    def _setup_timer_panel(self, frame):
+        timer_frame = ttk.LabelFrame(frame, text="Timers", padding=5)
+        timer_frame.grid(row=6, column=0, columnspan=4, pady=5, padx=5, sticky=tk.W)
+
+        self.timers_tree = ttk.Treeview(timer_frame, columns=('Project', 'System', 'Task', 'Elapsed'),
+                                        show='headings', style="Treeview", height=4)
+        for col in ('Project', 'System', 'Task', 'Elapsed'):
+            self.timers_tree.heading(col, text=col, anchor=tk.W)
+            self.timers_tree.column(col, width=100, anchor=tk.W)
+        self.timers_tree.grid(row=0, column=0, rowspan=4, padx=(0, 5))
+
+        ttk.Button(timer_frame, text="Start timer from form",
+                   command=self.start_timer).grid(row=0, column=1, sticky=tk.EW, pady=1)
+        ttk.Button(timer_frame, text="Pause / Resume",
+                   command=self.toggle_timer).grid(row=1, column=1, sticky=tk.EW, pady=1)
+        ttk.Button(timer_frame, text="Stop and save",
+                   command=self.stop_timer).grid(row=2, column=1, sticky=tk.EW, pady=1)
+        ttk.Button(timer_frame, text="Discard",
+                   command=self.discard_timer).grid(row=3, column=1, sticky=tk.EW, pady=1)
+
+        # Timers recovered from the journal come back paused
+        for timer in self.timer_manager.timers.values():
+            self._insert_timer_row(timer)
+        self.root.after(1000, self._tick_timers)
+
     def _setup_form_fields(self, entry_frame):
         # Project field with label
         ttk.Label(entry_frame, text='Project').grid(row=0, column=0, padx=(0,5), pady=5, sticky=tk.W)
@@ -262,7 +338,22 @@ class TimeTrackerGUI:
         
         # Refresh data if connected
         if self.db_manager.is_connected:
+            self.change_seq = self.db_manager.get_change_seq()
+            self.snapshot_store.reload()
             self.refresh_entries()
+            self.heatmap.reload()
+            # Done once per connect rather than on every write to keep saves fast, and
+            # after startup so a write-locked share cannot stop the window from opening
+            self.root.after(self.CHANGE_POLL_MS, self._take_due_snapshots)
+
+    def _take_due_snapshots(self):
+        """Optional journal maintenance; a busy share just leaves it for the next connect"""
+        if not self.db_manager.is_connected:
+            return
+        try:
+            self.edit_journal.take_due_snapshots()
+        except sqlite3.Error:
+            pass
 
     def add_entry(self):
         if not self.db_manager.is_connected:
@@ -281,9 +372,11 @@ class TimeTrackerGUI:
 
             week_dates = self.get_selected_week_dates()
             date = self.date_utils.get_date_for_day(week_dates, day_of_week)
+            if self.check_week_closed():
+                return
 
             self.db_manager.add_entry(date, day_of_week, project, system, hours, task, notes)
-            self.refresh_entries()
+            self.poll_changes()
             self.clear_entries()
             
             # Set focus back to Project field after adding entry
@@ -291,6 +384,8 @@ class TimeTrackerGUI:
 
         except ValueError as e:
             messagebox.showerror("Error", "Please enter valid values")
+        except sqlite3.IntegrityError:
+            self.handle_week_closed_error()
 
     def get_selected_week_dates(self):
         week = self.selected_week.get()
@@ -311,15 +406,41 @@ class TimeTrackerGUI:
         self.tree.tag_configure('evenrow', background=self.tree_even_color)
 
         week_dates = self.get_selected_week_dates()
-        entries = self.db_manager.get_entries_for_week(
+        entries = self.entry_repo.load_week(
             week_dates[0].strftime('%Y-%m-%d'),
             week_dates[6].strftime('%Y-%m-%d')
         )
 
+        # Row iid is the entry id, so edits can look the entry up in the repository
         for i, entry in enumerate(entries):
-            values = list(entry[1:])
             tag = ('oddrow' if i % 2 else 'evenrow',)  # Alternate row colors
-            self.tree.insert('', 'end', values=values, tags=(entry[0], *tag))
+            self.tree.insert('', 'end', iid=str(entry.id), values=entry.display_values(), tags=tag)
+
+        self.show_week_status()
+
+    def show_week_status(self):
+        if self.is_selected_week_closed():
+            self.status_label.config(text="Week closed - entries are read-only", foreground="blue")
+        else:
+            self.status_label.config(text="Connected to database", foreground="green")
+
+    def is_selected_week_closed(self):
+        return self.snapshot_store.is_closed(self.get_selected_week_dates()[0].strftime('%Y-%m-%d'))
+
+    def check_week_closed(self):
+        """Show an error and return True if the selected week is closed"""
+        # Pick up closes and reopens by other users before deciding
+        self.snapshot_store.refresh()
+        if self.is_selected_week_closed():
+            messagebox.showerror("Error", "This week is closed. Reopen it from the Week menu to make changes.")
+            return True
+        return False
+
+    def handle_week_closed_error(self):
+        """The database rejected a write because another user closed the week"""
+        messagebox.showerror("Error", "This week has been closed and can no longer be changed")
+        self.snapshot_store.reload()
+        self.refresh_entries()
 
     def clear_entries(self):
         for entry in self.entries.values():
@@ -336,14 +457,19 @@ class TimeTrackerGUI:
 
     def show_summary(self):
         week_dates = self.get_selected_week_dates()
-        data = self.db_manager.get_weekly_summary(
-            week_dates[0].strftime('%Y-%m-%d'),
-            week_dates[6].strftime('%Y-%m-%d')
-        )
+        snapshot = self.snapshot_store.get(week_dates[0].strftime('%Y-%m-%d'))
+        if snapshot is not None:
+            data = snapshot['summary']
+        else:
+            data = self.db_manager.get_weekly_summary(
+                week_dates[0].strftime('%Y-%m-%d'),
+                week_dates[6].strftime('%Y-%m-%d')
+            )
 
         # Create summary window
         summary = tk.Toplevel(self.root)
         summary.title("Weekly Summary")
+        summary.bind('<Destroy>', lambda e: setattr(self, 'summary_tree', None) if e.widget is summary else None)
 
         # Create treeview for summary
         tree = ttk.Treeview(summary,
@@ -366,6 +492,15 @@ class TimeTrackerGUI:
             tree.heading(day, text=day, anchor=tk.W)  # Left align header
             tree.column(day, width=100, anchor=tk.W)  # Left align content
 
+        # Keep a handle so change polling can update this window
+        self.summary_tree = tree
+        self.summary_week_start = week_dates[0].strftime('%Y-%m-%d')
+        self._fill_summary_tree(tree, data, week_dates)
+
+    def _fill_summary_tree(self, tree, data, week_dates):
+        for item in tree.get_children():
+            tree.delete(item)
+
         # Process data
         summary_dict = {}
         for project, day, hours in data:
@@ -379,6 +514,253 @@ class TimeTrackerGUI:
                                 for d in week_dates]
             tree.insert('', 'end', values=values, tags=('oddrow' if i % 2 else 'evenrow'))
 
+    def show_utilization(self):
+        """Show hours vs 40h for each of the selectable weeks, from the local analytics cache"""
+        if not self.db_manager.is_connected:
+            return
+        week_dates = self.date_utils.get_current_week_dates()
+        start = (week_dates[0] - timedelta(weeks=52)).strftime('%Y-%m-%d')
+        end = week_dates[6].strftime('%Y-%m-%d')
+        # The first build reads the whole table over the share, so keep it off the Tk thread
+        if not self.analytics_cache.start_weekly_utilization(start, end):
+            messagebox.showwarning("Warning", "Weekly utilization is already being calculated")
+            return
+        self.status_label.config(text="Calculating weekly utilization...", foreground="blue")
+        self.root.after(200, self._poll_utilization)
+
+    def _poll_utilization(self):
+        """Check the utilization worker without blocking the event loop"""
+        if self.analytics_cache.is_running():
+            self.root.after(200, self._poll_utilization)
+            return
+        if self.analytics_cache.last_error is not None:
+            self.status_label.config(text=f"Weekly utilization failed: {self.analytics_cache.last_error}",
+                                     foreground="red")
+            return
+        self.show_week_status()
+        self._show_utilization_window(self.analytics_cache.last_result or [])
+
+    def _show_utilization_window(self, data):
+        window = tk.Toplevel(self.root)
+        window.title("Weekly Utilization")
+        tree = ttk.Treeview(window, columns=('Week', 'Hours', 'Utilization'),
+                            show='headings', style="Treeview", height=20)
+        scrollbar = ttk.Scrollbar(window, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=tk.LEFT, padx=10, pady=10)
+        scrollbar.pack(side=tk.LEFT, fill=tk.Y, pady=10)
+
+        tree.tag_configure('oddrow', background=self.tree_odd_color)
+        tree.tag_configure('evenrow', background=self.tree_even_color)
+        for col in ('Week', 'Hours', 'Utilization'):
+            tree.heading(col, text=col, anchor=tk.W)
+            tree.column(col, width=100, anchor=tk.W)
+
+        # Newest week first, matching the week selector
+        for i, (monday, hours, ratio) in enumerate(reversed(data)):
+            tree.insert('', 'end', values=(monday, hours, f"{ratio:.0%}"),
+                        tags=('oddrow' if i % 2 else 'evenrow',))
+
+    def show_year_report(self):
+        """Show hours per project per month for the selected week's year"""
+        if not self.db_manager.is_connected:
+            return
+        year = self.get_selected_week_dates()[0].year
+        if not self.report_builder.start_build(f'{year}-01-01', f'{year}-12-31', ('project', 'month')):
+            messagebox.showwarning("Warning", "A report is already being built")
+            return
+        self.status_label.config(text=f"Building {year} report...", foreground="blue")
+        self.root.after(200, lambda: self._poll_year_report(year))
+
+    def _poll_year_report(self, year):
+        """Check the report worker without blocking the event loop"""
+        if self.report_builder.is_running():
+            self.root.after(200, lambda: self._poll_year_report(year))
+            return
+        if self.report_builder.last_error is not None:
+            self.status_label.config(text=f"Year report failed: {self.report_builder.last_error}", foreground="red")
+            return
+        self.show_week_status()
+        self._show_year_report_window(year, self.report_builder.last_result or [])
+
+    def _show_year_report_window(self, year, data):
+        months = [f'{year}-{m:02d}' for m in range(1, 13)]
+        month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+        report = tk.Toplevel(self.root)
+        report.title(f"Year Report {year}")
+        tree = ttk.Treeview(report, columns=['Project'] + month_names + ['Total'],
+                            show='headings', style="Treeview")
+        tree.pack(padx=10, pady=10)
+        tree.tag_configure('oddrow', background=self.tree_odd_color)
+        tree.tag_configure('evenrow', background=self.tree_even_color)
+        tree.heading('Project', text='Project', anchor=tk.W)
+        tree.column('Project', anchor=tk.W)
+        for name in month_names + ['Total']:
+            tree.heading(name, text=name, anchor=tk.W)
+            tree.column(name, width=60, anchor=tk.W)
+
+        # Pivot (project, month, hours) rows into one row per project
+        report_dict = {}
+        for project, month, hours in data:
+            report_dict.setdefault(project, {})[month] = hours
+        for i, (project, hours_by_month) in enumerate(report_dict.items()):
+            values = [project] + [hours_by_month.get(m, '') for m in months] + [sum(hours_by_month.values())]
+            tree.insert('', 'end', values=values, tags=('oddrow' if i % 2 else 'evenrow',))
+
+    def show_week_grid(self):
+        """Open the project x day grid editor for the selected week"""
+        if not self.db_manager.is_connected or self.check_week_closed():
+            return
+        WeekGridEditor(self.root, self.db_manager, self.entry_repo,
+                       self.get_selected_week_dates(), on_saved=self.poll_changes)
+
+    def copy_week_to_current(self):
+        """Preview and copy the selected week's entries into the current week"""
+        if not self.db_manager.is_connected:
+            return
+        source_dates = self.get_selected_week_dates()
+        target_dates = self.date_utils.get_current_week_dates()
+        source_start = source_dates[0].strftime('%Y-%m-%d')
+        source_end = source_dates[6].strftime('%Y-%m-%d')
+        target_start = target_dates[0].strftime('%Y-%m-%d')
+        if source_start == target_start:
+            messagebox.showwarning("Warning", "Select a past week to copy from")
+            return
+        if self.snapshot_store.is_closed(target_start):
+            messagebox.showerror("Error", "The current week is closed")
+            return
+
+        rows = self.db_manager.preview_copy_week(source_start, source_end, target_start)
+        if not rows:
+            messagebox.showinfo("Copy Week",
+                                "Nothing to copy: the selected week is empty or already in the current week")
+            return
+        existing = self.db_manager.count_entries(target_start, target_dates[6].strftime('%Y-%m-%d'))
+
+        def do_copy():
+            try:
+                self.db_manager.copy_week(source_start, source_end, target_start)
+            except sqlite3.IntegrityError:
+                self.handle_week_closed_error()
+                return
+            self.poll_changes()
+            self.selected_week.set(self.date_utils.format_week_label(0))
+            self.on_week_selected()
+
+        self._show_preview_window("Copy Week", rows, "Copy", do_copy, self._existing_entries_note(existing))
+
+    def save_week_template(self):
+        """Save the selected week's entries as a named template"""
+        if not self.db_manager.is_connected:
+            return
+        name = simpledialog.askstring("Save Template", "Template name:", parent=self.root)
+        if not name or not name.strip():
+            return
+        name = name.strip()
+        if name in self.db_manager.get_template_names() and not messagebox.askyesno(
+                "Save Template", f"Replace the existing template '{name}'?", icon='warning'):
+            return
+        week_dates = self.get_selected_week_dates()
+        count = self.db_manager.save_template(
+            name,
+            week_dates[0].strftime('%Y-%m-%d'),
+            week_dates[6].strftime('%Y-%m-%d')
+        )
+        if not count:
+            messagebox.showwarning("Warning", "The selected week has no entries, so no template was saved")
+
+    def apply_week_template(self):
+        """Pick a template, preview it against the selected week and insert it"""
+        if not self.db_manager.is_connected:
+            return
+        if self.check_week_closed():
+            return
+        names = self.db_manager.get_template_names()
+        if not names:
+            messagebox.showinfo("Templates", "No templates saved yet")
+            return
+        week_dates = self.get_selected_week_dates()
+        week_start = week_dates[0].strftime('%Y-%m-%d')
+        existing = self.db_manager.count_entries(week_start, week_dates[6].strftime('%Y-%m-%d'))
+
+        window, tree = self._create_preview_window("Apply Template")
+        template_var = tk.StringVar(value=names[0])
+        combo = ttk.Combobox(window, textvariable=template_var, values=names, state='readonly')
+        combo.pack(before=tree, padx=10, pady=(10, 0), anchor=tk.W)
+        note = self._existing_entries_note(existing)
+        if note:
+            ttk.Label(window, text=note, foreground="orange").pack(padx=10, pady=(0, 10), anchor=tk.W)
+
+        def load_preview(event=None):
+            self._fill_preview_tree(tree, self.db_manager.preview_template(template_var.get(), week_start))
+
+        def do_apply():
+            window.destroy()
+            try:
+                self.db_manager.apply_template(template_var.get(), week_start)
+            except sqlite3.IntegrityError:
+                self.handle_week_closed_error()
+                return
+            self.poll_changes()
+
+        def do_delete():
+            if messagebox.askyesno("Confirm Delete", f"Delete template '{template_var.get()}'?",
+                                   icon='warning', parent=window):
+                self.db_manager.delete_template(template_var.get())
+                window.destroy()
+
+        combo.bind('<<ComboboxSelected>>', load_preview)
+        button_frame = ttk.Frame(window)
+        button_frame.pack(padx=10, pady=(0, 10), anchor=tk.E)
+        ttk.Button(button_frame, text="Apply", command=do_apply).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Delete template", command=do_delete).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=window.destroy).pack(side=tk.LEFT, padx=5)
+        load_preview()
+
+    def _create_preview_window(self, title):
+        """Create a window with a table laid out like the main entries table"""
+        window = tk.Toplevel(self.root)
+        window.title(title)
+        columns = ('Project', 'System', 'Hours', 'Task', 'Day', 'Date', 'Notes')
+        tree = ttk.Treeview(window, columns=columns, show='headings', style="Treeview", height=12)
+        for col in columns:
+            tree.heading(col, text=col, anchor=tk.W)
+            tree.column(col, width=200 if col == 'Notes' else 100, anchor=tk.W)
+        tree.tag_configure('oddrow', background=self.tree_odd_color)
+        tree.tag_configure('evenrow', background=self.tree_even_color)
+        tree.pack(padx=10, pady=10)
+        return window, tree
+
+    def _fill_preview_tree(self, tree, rows):
+        for item in tree.get_children():
+            tree.delete(item)
+        for i, row in enumerate(rows):
+            tree.insert('', 'end', values=row, tags=('oddrow' if i % 2 else 'evenrow',))
+
+    @staticmethod
+    def _existing_entries_note(existing):
+        """Warning shown in copy/template previews when the target week is not empty"""
+        if not existing:
+            return None
+        return (f"The target week already has {existing} entries. Rows for a project/system/task "
+                f"that already has an entry on the same day are left out.")
+
+    def _show_preview_window(self, title, rows, confirm_text, on_confirm, note=None):
+        """Show rows that are about to be inserted and run on_confirm if accepted"""
+        window, tree = self._create_preview_window(title)
+        self._fill_preview_tree(tree, rows)
+        if note:
+            ttk.Label(window, text=note, foreground="orange").pack(padx=10, pady=(0, 10), anchor=tk.W)
+
+        def confirm():
+            window.destroy()
+            on_confirm()
+
+        button_frame = ttk.Frame(window)
+        button_frame.pack(padx=10, pady=(0, 10), anchor=tk.E)
+        ttk.Button(button_frame, text=confirm_text, command=confirm).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=window.destroy).pack(side=tk.LEFT, padx=5)
+
     def on_double_click(self, event):
         """Handle double click on a cell"""
         # Identify the clicked cell
@@ -392,6 +774,8 @@ class TimeTrackerGUI:
         
         if not item or not column:
             return
+        if self.check_week_closed():
+            return
 
         # Get column name and prevent editing of Date column
         column_name = self.tree.heading(column)['text']
@@ -400,22 +784,18 @@ class TimeTrackerGUI:
             
         # Get column index (0-based)
         column_idx = int(column[1]) - 1
-        
-        # If clicking Hours column, verify it's a number
-        if self.tree.heading(column)['text'] == 'Hours':
-            try:
-                float(self.tree.item(item)['values'][column_idx])
-            except:
-                self.tree.item(item)['values'][column_idx] = 0
+        entry = self.entry_repo.get(int(item))
+        if entry is None:
+            return
 
         # Position entry widget on top of cell
         bbox = self.tree.bbox(item, column)
         if not bbox:
             return
         
-        # Configure entry widget
+        # Configure entry widget from the model rather than the displayed text
         self.cell_editor.delete(0, tk.END)
-        self.cell_editor.insert(0, self.tree.item(item)['values'][column_idx])
+        self.cell_editor.insert(0, getattr(entry, TimeEntry.DISPLAY_FIELDS[column_idx]))
         self.cell_editor.place(x=bbox[0], y=bbox[1],
                              width=bbox[2], height=bbox[3])
         self.cell_editor.focus_set()
@@ -446,7 +826,9 @@ class TimeTrackerGUI:
             
         try:
             new_value = self.cell_editor.get()
-            current_values = list(self.tree.item(self.editing_item)['values'])
+            entry = self.entry_repo.get(int(self.editing_item))
+            if entry is None:
+                return
             
             # Validate based on column
             column_name = self.tree.heading(f'#{self.editing_column + 1}')['text']
@@ -464,41 +846,26 @@ class TimeTrackerGUI:
             elif column_name == 'Task' and new_value not in ['', 'Development', 'Support']:
                 messagebox.showerror("Error", "Task must be either Development, Support, or empty")
                 return
-            elif column_name == 'Day' and new_value and new_value not in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
+            elif column_name == 'Day' and new_value not in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
                 messagebox.showerror("Error", "Invalid day of week")
                 return
             elif column_name == 'System':
                 new_value = new_value.upper()
                 
-            current_values[self.editing_column] = new_value
+            changes = {TimeEntry.DISPLAY_FIELDS[self.editing_column]: new_value}
             
             # If Day was changed, update the Date
             if column_name == 'Day':
                 week_dates = self.get_selected_week_dates()
-                new_date = self.date_utils.get_date_for_day(week_dates, new_value)
-                current_values[5] = new_date  # Update date column
-            
-            # Always ensure hours is float for database
-            hours_val = float(current_values[2])
-            
-            # Update database with reordered values
-            entry_id = self.tree.item(self.editing_item)['tags'][0]
-            notes = current_values[6] if len(current_values) > 6 else ""  # Get notes from values
-            
-            self.db_manager.update_entry(
-                entry_id,
-                current_values[5],  # date
-                current_values[4],  # day
-                current_values[0],  # project
-                current_values[1],  # system
-                hours_val,          # hours
-                current_values[3],  # task
-                notes               # notes
-            )
-            
-            # Update tree display
-            self.tree.item(self.editing_item, values=current_values)
+                changes['date'] = self.date_utils.get_date_for_day(week_dates, new_value)
             
+            # Write only the changed columns, then redraw the row from the model
+            self.entry_repo.update_fields(entry.id, changes)
+            self.tree.item(self.editing_item, values=entry.display_values())
+            self.poll_changes()
+
+        except sqlite3.IntegrityError:
+            self.handle_week_closed_error()
         finally:
             self.cancel_edit()
 
@@ -515,9 +882,281 @@ class TimeTrackerGUI:
         week = self.selected_week.get()
         # Set checkbox based on whether current week is selected
         self.use_today.set('Current Week' in week)
+        self.snapshot_store.refresh()
         # Refresh entries as before
         self.refresh_entries(event)
 
+    def close_selected_week(self):
+        """Freeze the selected week and store its snapshot"""
+        if not self.db_manager.is_connected:
+            return
+        week_dates = self.get_selected_week_dates()
+        week_start = week_dates[0].strftime('%Y-%m-%d')
+        if self.snapshot_store.is_closed(week_start):
+            messagebox.showinfo("Close Week", "This week is already closed")
+            return
+        if not messagebox.askyesno("Close Week",
+                                   f"Close the week of {week_start}? Its entries will become read-only."):
+            return
+        try:
+            self.snapshot_store.close_week(week_start, week_dates[6].strftime('%Y-%m-%d'))
+        except sqlite3.IntegrityError:
+            # Someone else closed it first
+            self.snapshot_store.reload()
+        self.refresh_entries()
+
+    def reopen_selected_week(self):
+        """Reopen a closed week after asking for a reason for the audit log"""
+        if not self.db_manager.is_connected:
+            return
+        week_start = self.get_selected_week_dates()[0].strftime('%Y-%m-%d')
+        if not self.snapshot_store.is_closed(week_start):
+            messagebox.showinfo("Reopen Week", "This week is not closed")
+            return
+        reason = simpledialog.askstring("Reopen Week", "Reason for reopening:", parent=self.root)
+        if not reason or not reason.strip():
+            return
+        self.snapshot_store.reopen_week(week_start, reason.strip())
+        self.snapshot_store.reload()
+        self.refresh_entries()
+
+    def show_week_as_of(self):
+        """Show the selected week's entries as they were at a past moment"""
+        if not self.db_manager.is_connected:
+            return
+        week_start = self.get_selected_week_dates()[0].strftime('%Y-%m-%d')
+        as_of = simpledialog.askstring("Week As Of", "Show the week as it was at (YYYY-MM-DD HH:MM):",
+                                       parent=self.root)
+        if not as_of or not as_of.strip():
+            return
+        as_of = as_of.strip()
+        try:
+            moment = datetime.strptime(as_of, '%Y-%m-%d %H:%M' if ':' in as_of else '%Y-%m-%d')
+        except ValueError:
+            messagebox.showerror("Error", "Enter a date as YYYY-MM-DD or YYYY-MM-DD HH:MM")
+            return
+        if ':' not in as_of:
+            moment += timedelta(days=1, seconds=-1)  # A bare date means the end of that day
+        entries = self.edit_journal.week_as_of(week_start, moment.strftime('%Y-%m-%d %H:%M:%S'))
+        if entries is None:
+            messagebox.showinfo("Week As Of", f"No history is recorded before the edit journal started "
+                                              f"({self.edit_journal.journal_start() or 'not yet'})")
+            return
+
+        window, tree = self._create_preview_window(f"Week of {week_start} as of {as_of}")
+        self._fill_preview_tree(tree, [entry.display_values() for entry in entries])
+        ttk.Label(window, text=f"Total hours: {sum(entry.hours for entry in entries)}").pack(
+            padx=10, pady=(0, 10), anchor=tk.W)
+
+    def show_week_history(self):
+        """List every recorded change to the selected week's entries"""
+        if not self.db_manager.is_connected:
+            return
+        week_start = self.get_selected_week_dates()[0].strftime('%Y-%m-%d')
+        history = self.edit_journal.get_week_history(week_start)
+
+        window = tk.Toplevel(self.root)
+        window.title(f"Change History ({week_start})")
+        columns = ('When', 'User', 'Change', 'Entry', 'Details')
+        tree = ttk.Treeview(window, columns=columns, show='headings', style="Treeview", height=15)
+        scrollbar = ttk.Scrollbar(window, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=tk.LEFT, padx=10, pady=10)
+        scrollbar.pack(side=tk.LEFT, fill=tk.Y, pady=10)
+
+        tree.tag_configure('oddrow', background=self.tree_odd_color)
+        tree.tag_configure('evenrow', background=self.tree_even_color)
+        for col in columns:
+            tree.heading(col, text=col, anchor=tk.W)
+            tree.column(col, width=400 if col == 'Details' else 120, anchor=tk.W)
+
+        # Newest change first
+        for i, (at, user, op, entry_id, data) in enumerate(reversed(history)):
+            details = ', '.join(f"{field}={value}" for field, value in data.items())
+            tree.insert('', 'end', values=(at, user or '(unknown)', op, entry_id, details),
+                        tags=('oddrow' if i % 2 else 'evenrow',))
+
+    def _insert_timer_row(self, timer):
+        elapsed = self.timer_manager.format_elapsed(timer.current_elapsed())
+        if not timer.is_running:
+            elapsed += " (paused)"
+        self.timers_tree.insert('', 'end', iid=str(timer.id),
+                                values=(timer.project, timer.system, timer.task, elapsed))
+
+    def _tick_timers(self):
+        """Update running timers' elapsed display; checkpoint to the journal every few seconds"""
+        for timer in self.timer_manager.timers.values():
+            if timer.is_running:
+                self.timers_tree.set(str(timer.id), 'Elapsed',
+                                     self.timer_manager.format_elapsed(timer.current_elapsed()))
+        if self.timer_manager.checkpoint_due():
+            self.timer_manager.checkpoint()
+        self.root.after(1000, self._tick_timers)
+
+    def _selected_timer(self):
+        selection = self.timers_tree.selection()
+        if not selection:
+            messagebox.showwarning("Warning", "Please select a timer")
+            return None
+        return self.timer_manager.timers.get(int(selection[0]))
+
+    def start_timer(self):
+        """Start a timer for the project, system, task and notes in the entry form"""
+        project = self.entries['project'].get().strip()
+        task = self.entries['task'].get().strip()
+        notes = self.entries['notes'].get().strip()
+        if not project or not (task or notes):
+            messagebox.showerror("Error", "Enter a project and a task or notes to start a timer")
+            return
+        timer = self.timer_manager.start(project, self.entries['system'].get().upper(), task, notes)
+        self._insert_timer_row(timer)
+        self.clear_entries()
+
+    def toggle_timer(self):
+        timer = self._selected_timer()
+        if timer is None:
+            return
+        if timer.is_running:
+            self.timer_manager.pause(timer.id)
+            self.timers_tree.set(str(timer.id), 'Elapsed',
+                                 self.timer_manager.format_elapsed(timer.elapsed) + " (paused)")
+        else:
+            self.timer_manager.resume(timer.id)
+
+    def stop_timer(self):
+        """Round the timer to 0.25h and save it as an entry for today"""
+        timer = self._selected_timer()
+        if timer is None or not self.db_manager.is_connected:
+            return
+        self.timer_manager.pause(timer.id)
+        self.timers_tree.set(str(timer.id), 'Elapsed',
+                             self.timer_manager.format_elapsed(timer.elapsed) + " (paused)")
+        hours = self.timer_manager.round_hours(timer.elapsed)
+        if hours == 0:
+            if messagebox.askyesno("Stop Timer", "Less than 0.25 hours recorded. Discard this timer?"):
+                self.discard_timer(confirm=False)
+            return
+
+        week_dates = self.date_utils.get_current_week_dates()
+        day_of_week = self.date_utils.get_today_day_of_week()
+        date = self.date_utils.get_date_for_day(week_dates, day_of_week)
+        if self.snapshot_store.is_closed(week_dates[0].strftime('%Y-%m-%d')):
+            messagebox.showerror("Error", "The current week is closed")
+            return
+        try:
+            self.db_manager.add_entry(date, day_of_week, timer.project, timer.system,
+                                      hours, timer.task, timer.notes)
+        except sqlite3.IntegrityError:
+            self.handle_week_closed_error()
+            return
+
+        # Only drop the timer once its entry is committed
+        self.timer_manager.stop(timer.id)
+        self.timers_tree.delete(str(timer.id))
+        self.poll_changes()
+
+    def discard_timer(self, confirm=True):
+        timer = self._selected_timer()
+        if timer is None:
+            return
+        if confirm and not messagebox.askyesno("Discard Timer", "Discard this timer without saving?"):
+            return
+        self.timer_manager.discard(timer.id)
+        self.timers_tree.delete(str(timer.id))
+
+    def _poll_changes_loop(self):
+        try:
+            self.poll_changes()
+        finally:
+            # Keep polling whatever happened this time
+            self.root.after(self.CHANGE_POLL_MS, self._poll_changes_loop)
+
+    def poll_changes(self):
+        """Apply time_entries changes made since the last poll, by anyone, as deltas"""
+        if not self.db_manager.is_connected:
+            return
+        try:
+            self._apply_changes_since_last_poll()
+        except sqlite3.Error:
+            # E.g. 'database is locked' on a busy share. change_seq only moves once
+            # a batch is applied, and applying is idempotent, so the next poll catches up
+            pass
+
+    def _apply_changes_since_last_poll(self):
+        if self.snapshot_store.refresh():
+            # Another user closed or reopened a week; it may be the visible one
+            self.refresh_entries()
+        changes = self.db_manager.get_changes_since(self.change_seq)
+        if changes is None:
+            # Too far behind the pruned log; reload everything
+            self.change_seq = self.db_manager.get_change_seq()
+            self.refresh_entries()
+            self.heatmap.reload()
+            self._refresh_open_summary()
+            return
+        if not changes:
+            return
+
+        week_dates = self.get_selected_week_dates()
+        week_start = week_dates[0].strftime('%Y-%m-%d')
+        week_end = week_dates[6].strftime('%Y-%m-%d')
+        week_is_live = not self.snapshot_store.is_closed(week_start)
+        touched_days = set()
+        for change in changes:
+            seq, op, entry_id, old_date, *values = change
+            date = values[5]
+            touched_days.update(day for day in (old_date, date) if day)
+            if week_is_live:
+                self._apply_entry_change(op, entry_id, values, week_start, week_end)
+        self.change_seq = changes[-1][0]
+
+        if week_is_live:
+            self._recolor_rows()
+            self._refresh_open_summary()
+        self.heatmap.refresh_days(touched_days)
+
+    def _apply_entry_change(self, op, entry_id, values, week_start, week_end):
+        """Upsert or remove one row of the visible week; safe to apply more than once"""
+        iid = str(entry_id)
+        if op != 'delete' and week_start <= values[5] <= week_end:
+            project, system, hours, task, day_of_week, date, notes = values
+            entry = TimeEntry(entry_id, project, system, hours, task, day_of_week, date, notes or '')
+            self.entry_repo.put(entry)
+            if self.tree.exists(iid):
+                self.tree.item(iid, values=entry.display_values())
+            else:
+                # Keep the table in date order, going by the rows' own Date column
+                index = sum(1 for child in self.tree.get_children()
+                            if self.tree.set(child, 'Date') <= date)
+                self.tree.insert('', index, iid=iid, values=entry.display_values())
+        else:
+            self.entry_repo.forget(entry_id)
+            if self.tree.exists(iid):
+                if self.editing_item == iid:
+                    self.cancel_edit()
+                self.tree.delete(iid)
+
+    def _recolor_rows(self):
+        for i, item in enumerate(self.tree.get_children()):
+            self.tree.item(item, tags=('oddrow' if i % 2 else 'evenrow',))
+
+    def _refresh_open_summary(self):
+        """Recompute an open weekly summary for the visible week from the loaded entries"""
+        week_dates = self.get_selected_week_dates()
+        if self.summary_tree is None or self.summary_week_start != week_dates[0].strftime('%Y-%m-%d'):
+            return
+        totals = {}
+        for entry in self.entry_repo.entries.values():
+            key = (entry.project, entry.day_of_week)
+            totals[key] = totals.get(key, 0) + entry.hours
+        data = [(project, day, hours) for (project, day), hours in totals.items()]
+        self._fill_summary_tree(self.summary_tree, data, week_dates)
+
+    def select_week(self, weeks_ago):
+        """Select a week in the week selector, e.g. from the heatmap"""
+        self.selected_week.set(self.date_utils.format_week_label(weeks_ago))
+        self.on_week_selected()
+
     def configure_database(self, initial=False):
         """Open dialog to configure database path"""
         message = "Please select the database file location" if initial else "Select Database Location"
@@ -540,6 +1179,27 @@ class TimeTrackerGUI:
             messagebox.showerror("Error", "No database selected. Application will exit.")
             self.root.quit()
 
+    def backup_database(self):
+        """Start an online backup in the background and poll for completion"""
+        if not self.db_manager.is_connected:
+            return
+        if not self.backup_manager.start_backup():
+            messagebox.showwarning("Warning", "A backup is already running")
+            return
+        self.status_label.config(text="Backing up database...", foreground="blue")
+        self.root.after(200, self._poll_backup)
+
+    def _poll_backup(self):
+        """Check the backup worker without blocking the event loop"""
+        if self.backup_manager.is_running():
+            self.root.after(200, self._poll_backup)
+            return
+        path = self.backup_manager.last_result
+        if path:
+            self.status_label.config(text=f"Backup saved to {path}", foreground="green")
+        else:
+            self.status_label.config(text="Backup failed", foreground="red")
+
     def on_use_today_changed(self, *args):
         """Handle changes to Use Today checkbox"""
         day_combo = self.entries['day']
@@ -560,14 +1220,19 @@ class TimeTrackerGUI:
         if not selected_items:
             messagebox.showwarning("Warning", "Please select a row to delete")
             return
+        if self.check_week_closed():
+            return
             
         if messagebox.askyesno("Confirm Delete",
                              "Are you sure you want to delete the selected row(s)?",
                              icon='warning'):
-            for item in selected_items:
-                entry_id = self.tree.item(item)['tags'][0]
-                self.db_manager.delete_entry(entry_id)
-            self.refresh_entries()
+            try:
+                for item in selected_items:
+                    self.entry_repo.delete(int(item))
+            except sqlite3.IntegrityError:
+                self.handle_week_closed_error()
+                return
+            self.poll_changes()
 
     def validate_required_fields(self, *args):
         """Enable/disable entry based on required fields, returns True if valid"""
@@ -615,6 +1280,7 @@ class TimeTrackerGUI:
 
     def run(self):
         self.root.mainloop()
+        self.report_builder.close()
 
     def on_project_focus(self, event):
         """When project field gets focus, select all text"""
@@ -3,6 +3,7 @@ from gui_manager import TimeTrackerGUI
 from date_utils import DateUtils
 import os
 import sys
+import multiprocessing
 
 def main():
     db_manager = DatabaseManager()
@@ -11,4 +12,6 @@ def main():
     gui.run()
 
 if __name__ == "__main__":
+    # Needed for report worker processes in the PyInstaller build
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,117 @@
+import os
+import threading
+from datetime import date, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from database_manager import DatabaseManager
+
+# Grouping names accepted by build() and the SQL expression each one groups on
+GROUPINGS = {
+    'project': 'project',
+    'system': 'system',
+    'task': 'task',
+    'day_of_week': 'day_of_week',
+    'date': 'date',
+    'month': "substr(date, 1, 7)",
+    'year': "substr(date, 1, 4)",
+}
+
+def split_months(start_date, end_date):
+    """Split an inclusive 'YYYY-MM-DD' range into per-month (start, end) shards"""
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    shards = []
+    while start <= end:
+        next_month = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        shard_end = min(end, next_month - timedelta(days=1))
+        shards.append((start.strftime('%Y-%m-%d'), shard_end.strftime('%Y-%m-%d')))
+        start = next_month
+    return shards
+
+def aggregate_shard(db_path, start_date, end_date, group_by):
+    """Sum hours for one date shard on its own read-only connection (runs in a worker process)"""
+    columns = ', '.join(GROUPINGS[name] for name in group_by)
+    conn = DatabaseManager.connect_read_only(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT {columns}, SUM(hours)
+            FROM time_entries
+            WHERE date BETWEEN ? AND ?
+            GROUP BY {columns}
+        ''', (start_date, end_date))
+        return cursor.fetchall()
+    finally:
+        conn.close()
+
+class ReportBuilder:
+    # Default worker cap: shards are mostly I/O on the shared file, and each
+    # worker of the frozen exe pays a full interpreter start
+    DEFAULT_MAX_WORKERS = 4
+
+    def __init__(self, db_manager, max_workers=None):
+        self.db_manager = db_manager
+        self.max_workers = max_workers or min(self.DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+        self.executor = None     # Started on first parallel build and reused after that
+        self.worker = None
+        self.last_result = None
+        self.last_error = None
+
+    def build(self, start_date, end_date, group_by=('project', 'day_of_week')):
+        """Return [(*group values, total hours)] for the range, like get_weekly_summary.
+
+        The range is split into month shards that are aggregated concurrently
+        and the partial sums merged here.
+        """
+        if not self.db_manager.is_connected:
+            return []
+        group_by = tuple(group_by)
+        unknown = [name for name in group_by if name not in GROUPINGS]
+        if not group_by or unknown:
+            raise ValueError(f"Unsupported grouping: {', '.join(unknown) or 'none given'}")
+
+        shards = split_months(start_date, end_date)
+        totals = {}
+        if self.max_workers == 1 or len(shards) == 1:
+            partials = (aggregate_shard(self.db_manager.db_path, start, end, group_by)
+                        for start, end in shards)
+            self._merge(totals, partials)
+        else:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            futures = [self.executor.submit(aggregate_shard, self.db_manager.db_path, start, end, group_by)
+                       for start, end in shards]
+            self._merge(totals, (future.result() for future in futures))
+
+        return [(*key, hours) for key, hours in sorted(totals.items())]
+
+    def start_build(self, start_date, end_date, group_by=('project', 'day_of_week')):
+        """Run build on a background thread; the rows land in last_result (or last_error)"""
+        if self.is_running():
+            return False
+        self.last_result = None
+        self.last_error = None
+
+        def run():
+            try:
+                self.last_result = self.build(start_date, end_date, group_by)
+            except Exception as e:
+                self.last_error = e
+
+        self.worker = threading.Thread(target=run, daemon=True)
+        self.worker.start()
+        return True
+
+    def is_running(self):
+        return self.worker is not None and self.worker.is_alive()
+
+    def close(self):
+        """Stop the worker processes, if any were started"""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def _merge(self, totals, partials):
+        for rows in partials:
+            for *key, hours in rows:
+                key = tuple(key)
+                totals[key] = totals.get(key, 0) + hours
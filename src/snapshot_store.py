@@ -0,0 +1,94 @@
+import os
+import json
+import getpass
+
+class SnapshotStore:
+    """Local cache of closed-week snapshots.
+
+    A closed week's snapshot never changes, so once fetched it is kept on
+    disk and served without touching the database. Files are named by
+    week start and close time, so a week that is reopened and closed again
+    gets a new file rather than reusing a stale one.
+    """
+
+    def __init__(self, db_manager, cache_dir=None):
+        self.db_manager = db_manager
+        self.cache_dir = cache_dir or os.path.join(os.path.expanduser("~"), '.timetracker', 'snapshots')
+        self.closed_weeks = {}   # week_start -> closed_at
+        self.snapshots = {}      # week_start -> snapshot dict
+        self.version = None      # get_close_out_version() when closed_weeks was loaded
+
+    def reload(self):
+        """Refresh the list of closed weeks (one small query)"""
+        # Read the version first so a close racing this load triggers another reload
+        self.version = self.db_manager.get_close_out_version()
+        self.closed_weeks = self.db_manager.get_closed_weeks()
+        self.snapshots = {week: snap for week, snap in self.snapshots.items()
+                          if self.closed_weeks.get(week) == snap['closed_at']}
+
+    def refresh(self):
+        """Reload if any week was closed or reopened since the last load; returns True if it was"""
+        if self.db_manager.get_close_out_version() == self.version:
+            return False
+        self.reload()
+        return True
+
+    def is_closed(self, week_start):
+        return week_start in self.closed_weeks
+
+    def _path(self, week_start, closed_at):
+        stamp = closed_at.replace(':', '').replace(' ', '_')
+        return os.path.join(self.cache_dir, f'{week_start}_{stamp}.json')
+
+    def _write(self, week_start, closed_at, snapshot_json):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(week_start, closed_at)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(snapshot_json)
+        os.replace(tmp_path, path)
+
+    def get(self, week_start):
+        """Return the snapshot dict for a closed week, or None if the week is open"""
+        closed_at = self.closed_weeks.get(week_start)
+        if closed_at is None:
+            return None
+        if week_start in self.snapshots:
+            return self.snapshots[week_start]
+
+        path = self._path(week_start, closed_at)
+        try:
+            with open(path, 'r') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            # First view of this closed week on this machine
+            row = self.db_manager.get_week_snapshot(week_start)
+            if row is None:
+                return None
+            closed_at, snapshot_json = row
+            self._write(week_start, closed_at, snapshot_json)
+            snapshot = json.loads(snapshot_json)
+        self.snapshots[week_start] = snapshot
+        return snapshot
+
+    def close_week(self, week_start, week_end):
+        result = self.db_manager.close_week(week_start, week_end, getpass.getuser())
+        if not result:
+            return False
+        closed_at, snapshot_json = result
+        self._write(week_start, closed_at, snapshot_json)
+        self.closed_weeks[week_start] = closed_at
+        self.snapshots[week_start] = json.loads(snapshot_json)
+        return True
+
+    def reopen_week(self, week_start, reason):
+        if not self.db_manager.reopen_week(week_start, getpass.getuser(), reason):
+            return False
+        closed_at = self.closed_weeks.pop(week_start, None)
+        self.snapshots.pop(week_start, None)
+        if closed_at:
+            try:
+                os.remove(self._path(week_start, closed_at))
+            except OSError:
+                pass
+        return True
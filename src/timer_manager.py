@@ -0,0 +1,150 @@
+import os
+import json
+import time
+
+class Timer:
+    __slots__ = ('id', 'project', 'system', 'task', 'notes', 'elapsed', 'running_since')
+
+    def __init__(self, id, project, system, task, notes, elapsed=0.0):
+        self.id = id
+        self.project = project
+        self.system = system
+        self.task = task
+        self.notes = notes
+        self.elapsed = elapsed        # Seconds accumulated before the current run
+        self.running_since = None     # time.monotonic() when started/resumed, None if paused
+
+    @property
+    def is_running(self):
+        return self.running_since is not None
+
+    def current_elapsed(self, now=None):
+        if self.running_since is None:
+            return self.elapsed
+        return self.elapsed + (now or time.monotonic()) - self.running_since
+
+
+class TimerManager:
+    """Running stopwatch timers, checkpointed to a local append-only journal.
+
+    Each journal line is a JSON event (start, pause, resume, checkpoint,
+    stop, discard). Replaying the journal after a crash restores every open
+    timer, paused at its last checkpointed elapsed time.
+    """
+    CHECKPOINT_INTERVAL = 15  # Seconds between elapsed-time checkpoints
+
+    def __init__(self, journal_path=None):
+        self.journal_path = journal_path or os.path.join(os.path.expanduser("~"), '.timetracker', 'timers.journal')
+        self.timers = {}
+        self.next_id = 1
+        self.last_checkpoint = time.monotonic()
+        self._recover()
+
+    def _append(self, event):
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        with open(self.journal_path, 'a') as f:
+            f.write(json.dumps(event, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _recover(self):
+        """Replay the journal, then compact it down to the recovered timers"""
+        try:
+            with open(self.journal_path, 'r') as f:
+                lines = f.readlines()
+        except OSError:
+            return
+
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue  # Partial last line from a crash mid-write
+            op = event.get('op')
+            timer_id = event.get('id')
+            if op == 'start':
+                self.timers[timer_id] = Timer(timer_id, event['project'], event['system'],
+                                              event['task'], event['notes'])
+                self.next_id = max(self.next_id, timer_id + 1)
+            elif timer_id in self.timers and op in ('pause', 'checkpoint'):
+                self.timers[timer_id].elapsed = event['elapsed']
+            elif op in ('stop', 'discard'):
+                self.timers.pop(timer_id, None)
+
+        self._compact()
+
+    def _compact(self):
+        """Rewrite the journal with just the open timers"""
+        tmp_path = self.journal_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for timer in self.timers.values():
+                f.write(json.dumps({'op': 'start', 'id': timer.id, 'project': timer.project,
+                                    'system': timer.system, 'task': timer.task, 'notes': timer.notes},
+                                   separators=(',', ':')) + '\n')
+                f.write(json.dumps({'op': 'pause', 'id': timer.id, 'elapsed': timer.current_elapsed()},
+                                   separators=(',', ':')) + '\n')
+        os.replace(tmp_path, self.journal_path)
+
+    def start(self, project, system, task, notes=''):
+        timer = Timer(self.next_id, project, system, task, notes)
+        self.next_id += 1
+        timer.running_since = time.monotonic()
+        self.timers[timer.id] = timer
+        self._append({'op': 'start', 'id': timer.id, 'project': project, 'system': system,
+                      'task': task, 'notes': notes})
+        return timer
+
+    def pause(self, timer_id):
+        timer = self.timers[timer_id]
+        if timer.is_running:
+            timer.elapsed = timer.current_elapsed()
+            timer.running_since = None
+            self._append({'op': 'pause', 'id': timer_id, 'elapsed': timer.elapsed})
+
+    def resume(self, timer_id):
+        timer = self.timers[timer_id]
+        if not timer.is_running:
+            timer.running_since = time.monotonic()
+            self._append({'op': 'resume', 'id': timer_id})
+
+    def checkpoint_due(self):
+        return time.monotonic() - self.last_checkpoint >= self.CHECKPOINT_INTERVAL
+
+    def checkpoint(self):
+        """Record the elapsed time of every running timer"""
+        now = time.monotonic()
+        self.last_checkpoint = now
+        running = [timer for timer in self.timers.values() if timer.is_running]
+        if not running:
+            return
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        with open(self.journal_path, 'a') as f:
+            for timer in running:
+                f.write(json.dumps({'op': 'checkpoint', 'id': timer.id,
+                                    'elapsed': timer.current_elapsed(now)}, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def stop(self, timer_id):
+        """Remove a timer once its entry has been committed"""
+        timer = self.timers.pop(timer_id, None)
+        self._append({'op': 'stop', 'id': timer_id})
+        if not self.timers:
+            self._compact()
+        return timer
+
+    def discard(self, timer_id):
+        self.timers.pop(timer_id, None)
+        self._append({'op': 'discard', 'id': timer_id})
+        if not self.timers:
+            self._compact()
+
+    @staticmethod
+    def round_hours(seconds):
+        """Round to the nearest 0.25h, the granularity entries are logged in"""
+        return round(seconds / 3600 * 4) / 4
+
+    @staticmethod
+    def format_elapsed(seconds):
+        seconds = int(seconds)
+        return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
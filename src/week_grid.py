@@ -0,0 +1,189 @@
+import sqlite3
+import tkinter as tk
+from tkinter import ttk
+from tkinter import messagebox
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+KEY_COLUMNS = ['Project', 'System', 'Task']
+
+class WeekGridEditor:
+    """Spreadsheet-style editor for one week: a row per project/system/task, a column per day.
+
+    The grid starts from the entries already loaded in the repository. On save
+    it is diffed against that starting state and only changed cells are
+    written, all in one transaction.
+    """
+
+    def __init__(self, root, db_manager, entry_repo, week_dates, on_saved=None):
+        self.db_manager = db_manager
+        self.week_dates = week_dates
+        self.on_saved = on_saved
+
+        self.window = tk.Toplevel(root)
+        self.window.title(f"Week Grid ({week_dates[0].strftime('%Y-%m-%d')})")
+
+        self.tree = ttk.Treeview(self.window, columns=KEY_COLUMNS + DAYS + ['Total'],
+                                 show='headings', style="Treeview", height=15)
+        for col in KEY_COLUMNS + DAYS + ['Total']:
+            self.tree.heading(col, text=col, anchor=tk.W)
+            self.tree.column(col, width=120 if col == 'Project' else 80, anchor=tk.W)
+        self.tree.pack(padx=10, pady=10)
+
+        button_frame = ttk.Frame(self.window)
+        button_frame.pack(padx=10, pady=(0, 10), anchor=tk.E)
+        ttk.Button(button_frame, text="Add row", command=self.add_row).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Save", command=self.save).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=self.window.destroy).pack(side=tk.LEFT, padx=5)
+
+        self.cell_editor = ttk.Entry(self.tree)
+        self.cell_editor.bind('<Return>', lambda e: self.finish_edit())
+        self.cell_editor.bind('<FocusOut>', lambda e: self.finish_edit())
+        self.cell_editor.bind('<Escape>', lambda e: self.cancel_edit())
+        self.tree.bind('<Double-1>', self.on_double_click)
+        self.editing = None
+
+        # row iid -> {'key': [project, system, task], 'cells': {day: [entry ids]}, 'hours': {day: hours}}
+        self.rows = {}
+        self.original_hours = {}   # (iid, day) -> hours as loaded
+        self.new_row_count = 0
+        self._load(entry_repo.entries.values())
+
+    def _load(self, entries):
+        rows_by_key = {}
+        for entry in sorted(entries, key=lambda e: (e.project, e.system, e.task)):
+            key = (entry.project, entry.system, entry.task)
+            if key not in rows_by_key:
+                iid = f'row{len(rows_by_key)}'
+                rows_by_key[key] = iid
+                self.rows[iid] = {'key': list(key), 'cells': {day: [] for day in DAYS},
+                                  'hours': {day: 0 for day in DAYS}}
+            row = self.rows[rows_by_key[key]]
+            row['cells'][entry.day_of_week].append(entry.id)
+            row['hours'][entry.day_of_week] += entry.hours
+
+        for iid, row in self.rows.items():
+            for day in DAYS:
+                self.original_hours[(iid, day)] = row['hours'][day]
+            self.tree.insert('', 'end', iid=iid, values=self._row_values(row))
+
+    def _row_values(self, row):
+        hours = [row['hours'][day] or '' for day in DAYS]
+        return row['key'] + hours + [sum(row['hours'].values())]
+
+    def add_row(self):
+        iid = f'new{self.new_row_count}'
+        self.new_row_count += 1
+        self.rows[iid] = {'key': ['', '', ''], 'cells': {day: [] for day in DAYS},
+                          'hours': {day: 0 for day in DAYS}, 'new': True}
+        self.tree.insert('', 'end', iid=iid, values=self._row_values(self.rows[iid]))
+
+    def on_double_click(self, event):
+        if self.tree.identify('region', event.x, event.y) != 'cell':
+            return
+        iid = self.tree.identify_row(event.y)
+        column = self.tree.identify_column(event.x)
+        if not iid or not column:
+            return
+        col_name = self.tree.heading(column)['text']
+        row = self.rows[iid]
+        if col_name == 'Total':
+            return
+        if col_name in KEY_COLUMNS and not row.get('new'):
+            messagebox.showinfo("Week Grid", "Project, system and task can only be set on new rows",
+                                parent=self.window)
+            return
+        if col_name in DAYS and len(row['cells'][col_name]) > 1:
+            messagebox.showinfo("Week Grid", "Several entries make up this cell. Edit them in the main table.",
+                                parent=self.window)
+            return
+
+        bbox = self.tree.bbox(iid, column)
+        if not bbox:
+            return
+        self.cell_editor.delete(0, tk.END)
+        self.cell_editor.insert(0, self.tree.set(iid, col_name))
+        self.cell_editor.place(x=bbox[0], y=bbox[1], width=bbox[2], height=bbox[3])
+        self.cell_editor.focus_set()
+        self.cell_editor.select_range(0, tk.END)
+        self.editing = (iid, col_name)
+
+    def finish_edit(self):
+        if not self.editing:
+            return
+        iid, col_name = self.editing
+        value = self.cell_editor.get().strip()
+        row = self.rows[iid]
+        if col_name in DAYS:
+            try:
+                hours = float(value) if value else 0
+            except ValueError:
+                hours = None
+            if hours is None or hours < 0 or hours % 0.25 != 0:
+                self.cancel_edit()
+                messagebox.showerror("Error", "Hours must be a non-negative multiple of 0.25",
+                                     parent=self.window)
+                return
+            row['hours'][col_name] = hours
+        else:
+            if col_name == 'Task' and value not in ['', 'Development', 'Support']:
+                self.cancel_edit()
+                messagebox.showerror("Error", "Task must be either Development, Support, or empty",
+                                     parent=self.window)
+                return
+            key = list(row['key'])
+            key[KEY_COLUMNS.index(col_name)] = value.upper() if col_name == 'System' else value
+            # One entry per project/system/task per day, as copy-week and templates keep it
+            if key[0] and any(other['key'] == key for other_iid, other in self.rows.items() if other_iid != iid):
+                self.cancel_edit()
+                messagebox.showerror("Error", "There is already a row for this project, system and task. "
+                                              "Enter the hours on that row.", parent=self.window)
+                return
+            row['key'] = key
+        self.tree.item(iid, values=self._row_values(row))
+        self.cancel_edit()
+
+    def cancel_edit(self):
+        self.cell_editor.place_forget()
+        self.editing = None
+
+    def diff(self):
+        """Return (inserts, updates, deletes) needed to turn the loaded week into the grid"""
+        inserts, updates, deletes = [], [], []
+        for iid, row in self.rows.items():
+            project, system, task = row['key']
+            for i, day in enumerate(DAYS):
+                hours = row['hours'][day]
+                if hours == self.original_hours.get((iid, day), 0):
+                    continue
+                entry_ids = row['cells'][day]
+                if not entry_ids:
+                    date = self.week_dates[i].strftime('%Y-%m-%d')
+                    inserts.append((date, day, project, system, hours, task, ''))
+                elif hours == 0:
+                    deletes.append(entry_ids[0])
+                else:
+                    updates.append((hours, entry_ids[0]))
+        return inserts, updates, deletes
+
+    def save(self):
+        if self.editing:
+            self.finish_edit()
+        for row in self.rows.values():
+            if row.get('new') and any(row['hours'].values()) and not (row['key'][0] and row['key'][2]):
+                messagebox.showerror("Error", "New rows need a project and a task", parent=self.window)
+                return
+        inserts, updates, deletes = self.diff()
+        if inserts or updates or deletes:
+            try:
+                self.db_manager.apply_entry_changes(inserts, updates, deletes)
+            except sqlite3.IntegrityError:
+                messagebox.showerror("Error", "This week has been closed and can no longer be changed",
+                                     parent=self.window)
+                return
+            except sqlite3.Error as e:
+                # E.g. 'database is locked'; the grid stays open so the edits can be saved again
+                messagebox.showerror("Error", f"Could not save the week: {e}", parent=self.window)
+                return
+        self.window.destroy()
+        if self.on_saved:
+            self.on_saved()
@@ -0,0 +1,128 @@
+import tkinter as tk
+from tkinter import ttk
+from datetime import date, timedelta
+
+class WeekHeatmap:
+    """Compact grid of daily and weekly hour totals for the selectable weeks.
+
+    One column per week (oldest on the left), one row per weekday, plus a
+    bottom row for the week total. Totals come from a single grouped query
+    and are then kept current with refresh_days() as entries change.
+    """
+    CELL = 10
+    GAP = 2
+    WEEKS = 53
+    DAY_TARGET = 8
+    WEEK_TARGET = 40
+
+    def __init__(self, parent, db_manager, date_utils, on_week_click=None):
+        self.db_manager = db_manager
+        self.date_utils = date_utils
+        self.on_week_click = on_week_click
+        self.daily_totals = {}
+
+        self.frame = ttk.Frame(parent)
+        step = self.CELL + self.GAP
+        self.canvas = tk.Canvas(self.frame, width=self.WEEKS * step, height=8 * step + self.GAP,
+                                highlightthickness=0)
+        self.canvas.pack(anchor=tk.W)
+        self.info_label = ttk.Label(self.frame, text="")
+        self.info_label.pack(anchor=tk.W)
+
+        self.canvas.bind('<Motion>', self._on_motion)
+        self.canvas.bind('<Leave>', lambda e: self.info_label.config(text=""))
+        self.canvas.bind('<Button-1>', self._on_click)
+
+        self.cells = {}        # (weeks_ago, day_index) -> canvas item; day_index 7 is the week total
+        self.week_starts = []  # Monday of each column, oldest first
+        self._build_cells()
+
+    def grid(self, **kwargs):
+        self.frame.grid(**kwargs)
+
+    def _build_cells(self):
+        step = self.CELL + self.GAP
+        for col in range(self.WEEKS):
+            weeks_ago = self.WEEKS - 1 - col
+            self.week_starts.append(self.date_utils.get_week_dates(weeks_ago)[0].date())
+            for day_index in range(8):
+                # Leave a small gap above the week total row
+                y = day_index * step + (self.GAP if day_index == 7 else 0)
+                self.cells[(weeks_ago, day_index)] = self.canvas.create_rectangle(
+                    col * step, y, col * step + self.CELL, y + self.CELL, outline='', fill='#ebedf0')
+
+    def reload(self):
+        """Load every day's total in the selectable range with one grouped query"""
+        if not self.db_manager.is_connected:
+            return
+        start = self.week_starts[0]
+        end = self.week_starts[-1] + timedelta(days=6)
+        self.daily_totals = dict(self.db_manager.get_daily_totals(
+            start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')))
+        for weeks_ago in range(self.WEEKS):
+            self._redraw_week(weeks_ago)
+
+    def refresh_days(self, days):
+        """Re-read the totals of just the given 'YYYY-MM-DD' days and redraw their weeks"""
+        if not days or not self.db_manager.is_connected:
+            return
+        totals = dict(self.db_manager.get_daily_totals(min(days), max(days)))
+        weeks = set()
+        for day in days:
+            self.daily_totals[day] = totals.get(day, 0)
+            col = (date.fromisoformat(day) - self.week_starts[0]).days // 7
+            if 0 <= col < self.WEEKS:
+                weeks.add(self.WEEKS - 1 - col)
+        for weeks_ago in weeks:
+            self._redraw_week(weeks_ago)
+
+    def _week_hours(self, weeks_ago):
+        monday = self.week_starts[self.WEEKS - 1 - weeks_ago]
+        days = [(monday + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(7)]
+        return [self.daily_totals.get(day, 0) for day in days]
+
+    def _redraw_week(self, weeks_ago):
+        hours = self._week_hours(weeks_ago)
+        for day_index, day_hours in enumerate(hours):
+            self.canvas.itemconfig(self.cells[(weeks_ago, day_index)],
+                                   fill=self._color(day_hours, self.DAY_TARGET))
+        self.canvas.itemconfig(self.cells[(weeks_ago, 7)],
+                               fill=self._color(sum(hours), self.WEEK_TARGET))
+
+    @staticmethod
+    def _color(hours, target):
+        """Grey when empty, amber when under target, green when met"""
+        if hours <= 0:
+            return '#ebedf0'
+        ratio = hours / target
+        if ratio < 0.5:
+            return '#f9d77e'
+        if ratio < 1:
+            return '#f0a830'
+        if ratio <= 1.25:
+            return '#40a35a'
+        return '#1d6b35'
+
+    def _cell_at(self, x, y):
+        step = self.CELL + self.GAP
+        col, day_index = int(x // step), min(int(y // step), 7)
+        if not 0 <= col < self.WEEKS or y < 0:
+            return None, None
+        return self.WEEKS - 1 - col, day_index
+
+    def _on_motion(self, event):
+        weeks_ago, day_index = self._cell_at(event.x, event.y)
+        if weeks_ago is None:
+            return
+        hours = self._week_hours(weeks_ago)
+        monday = self.week_starts[self.WEEKS - 1 - weeks_ago]
+        text = f"Week of {monday.strftime('%Y-%m-%d')}: {sum(hours):g}h"
+        if day_index < 7:
+            day = monday + timedelta(days=day_index)
+            text += f"  |  {day.strftime('%A %Y-%m-%d')}: {hours[day_index]:g}h"
+        self.info_label.config(text=text)
+
+    def _on_click(self, event):
+        weeks_ago, day_index = self._cell_at(event.x, event.y)
+        if weeks_ago is not None and self.on_week_click:
+            self.on_week_click(weeks_ago)
@@ -0,0 +1,63 @@
+"""Compare report times from AnalyticsCache against the equivalent SQL.
+
+    python tools/bench_analytics.py --rows 500000
+
+Times the first cache build, a cache report with nothing changed, a
+report after a batch of edits (patched from change_log) and the same
+GROUP BY run directly on the database, and checks the results agree.
+"""
+import os
+import argparse
+import random
+
+from bench_common import temp_dir, build_database, open_manager, timed, summarize, PROJECTS
+from analytics_cache import AnalyticsCache
+
+def sql_hours_per_project_per_month(db_manager, start_date, end_date):
+    cursor = db_manager.conn.cursor()
+    cursor.execute('''
+        SELECT project, substr(date, 1, 7), SUM(hours)
+        FROM time_entries
+        WHERE date BETWEEN ? AND ?
+        GROUP BY project, substr(date, 1, 7)
+    ''', (start_date, end_date))
+    return {(project, month): hours for project, month, hours in cursor.fetchall()}
+
+def same(a, b):
+    return a.keys() == b.keys() and all(abs(a[key] - b[key]) < 1e-6 for key in a)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--edits', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--start', default='2016-01-01')
+    parser.add_argument('--end', default='2025-12-31')
+    args = parser.parse_args()
+
+    folder = temp_dir()
+    db_path = os.path.join(folder, 'timesheet.db')
+    build_database(db_path, args.rows)
+    db_manager = open_manager(db_path)
+    cache = AnalyticsCache(db_manager, cache_dir=os.path.join(folder, 'analytics'))
+    print(f"Database: {args.rows} rows, {os.path.getsize(db_path) / 1e6:.1f} MB")
+
+    seconds, _ = timed(cache.update)
+    print(f"Cache build:                 {seconds:.2f}s")
+
+    report = lambda: cache.hours_per_project_per_month(args.start, args.end)
+    sql = lambda: sql_hours_per_project_per_month(db_manager, args.start, args.end)
+    print(f"Cache report, no changes:    {summarize([timed(report)[0] for _ in range(args.repeat)])}")
+    print(f"SQL GROUP BY:                {summarize([timed(sql)[0] for _ in range(args.repeat)])}")
+
+    # Edits that keep the row count and total hours, which a fingerprint would miss
+    rng = random.Random(2)
+    for _ in range(args.edits):
+        entry_id = rng.randint(1, args.rows)
+        db_manager.update_entry_fields(entry_id, {'project': rng.choice(PROJECTS)})
+    seconds, result = timed(report)
+    print(f"Cache report after {args.edits} edits: {seconds * 1000:.2f}ms")
+    print(f"Cache matches SQL: {same(result, sql())}")
+
+if __name__ == '__main__':
+    main()
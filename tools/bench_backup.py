@@ -0,0 +1,56 @@
+"""Measure add_entry latency while BackupManager copies the database.
+
+    python tools/bench_backup.py --rows 200000
+
+Times add_entry with no backup running, then again on a second thread
+while create_backup runs, and reports how long the backup took.
+"""
+import os
+import argparse
+import threading
+import time
+
+from bench_common import temp_dir, build_database, open_manager, timed, summarize
+from backup_manager import BackupManager
+
+def add_one(db_manager):
+    db_manager.add_entry('2026-01-05', 'Monday', '9999', 'BENCH', 1.0, 'Support', '')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--samples', type=int, default=300)
+    parser.add_argument('--pages', type=int, default=64)
+    parser.add_argument('--pause', type=float, default=0.05)
+    args = parser.parse_args()
+
+    folder = temp_dir()
+    db_path = os.path.join(folder, 'timesheet.db')
+    build_database(db_path, args.rows)
+    db_manager = open_manager(db_path)
+    print(f"Database: {args.rows} rows, {os.path.getsize(db_path) / 1e6:.1f} MB in {folder}")
+
+    idle = [timed(add_one, db_manager)[0] for _ in range(args.samples)]
+    print(f"add_entry, no backup:     {summarize(idle)}")
+
+    backup_manager = BackupManager(db_manager, backup_dir=os.path.join(folder, 'backups'),
+                                   pages=args.pages, pause=args.pause)
+    result = {}
+
+    def run_backup():
+        result['seconds'], result['path'] = timed(backup_manager.create_backup)
+
+    worker = threading.Thread(target=run_backup)
+    worker.start()
+    during = []
+    while worker.is_alive():
+        during.append(timed(add_one, db_manager)[0])
+        time.sleep(0.01)
+    worker.join()
+
+    print(f"add_entry, during backup: {summarize(during)}")
+    print(f"Backup took {result['seconds']:.2f}s (pages={args.pages}, pause={args.pause}s), "
+          f"{'verified' if result['path'] else 'FAILED'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Shared helpers for the benchmark scripts in this folder.
+
+Each script builds a synthetic database in a temporary folder, so they can
+be run anywhere without touching the shared timesheet.
+"""
+import os
+import sys
+import atexit
+import shutil
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from database_manager import DatabaseManager
+
+PROJECTS = [f'{8000 + i}' for i in range(40)]
+SYSTEMS = ['PLC', 'HMI', 'SCADA', 'MES', 'ROBOT', '']
+TASKS = ['Development', 'Support', '']
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+def temp_dir():
+    """Make a scratch folder that is removed when the script exits"""
+    folder = tempfile.mkdtemp(prefix='timetracker_bench_')
+    atexit.register(shutil.rmtree, folder, ignore_errors=True)
+    return folder
+
+def build_database(path, rows, start='2016-01-04', days=3650, seed=1):
+    """Create a database at path with rows random entries spread over days from start.
+
+    Rows are written straight to the baseline table before DatabaseManager
+    opens the file, so change_log and journal triggers do not fire for them.
+    """
+    rng = random.Random(seed)
+    first = date.fromisoformat(start)
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS time_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            day_of_week TEXT NOT NULL,
+            project TEXT NOT NULL,
+            system TEXT NOT NULL,
+            hours REAL NOT NULL,
+            task TEXT NOT NULL,
+            notes TEXT
+        )
+    ''')
+
+    def generate():
+        for i in range(rows):
+            day = first + timedelta(days=i * days // rows)
+            yield (day.isoformat(), DAYS[day.weekday()], rng.choice(PROJECTS), rng.choice(SYSTEMS),
+                   rng.randint(1, 32) / 4, rng.choice(TASKS), '')
+
+    conn.executemany('''
+        INSERT INTO time_entries (date, day_of_week, project, system, hours, task, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', generate())
+    conn.commit()
+    conn.close()
+
+def open_manager(path):
+    db_manager = DatabaseManager(db_path=path)
+    if not db_manager.is_connected:
+        raise SystemExit(f"Could not open {path}")
+    return db_manager
+
+def timed(fn, *args, **kwargs):
+    """Return (seconds, result) of one call"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def summarize(samples):
+    """Format a list of second timings as mean/p50/p95/max in milliseconds"""
+    if not samples:
+        return 'no samples'
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    return (f"n={len(ordered)} mean={sum(ordered) / len(ordered) * 1000:.2f}ms "
+            f"p50={pick(0.5):.2f}ms p95={pick(0.95):.2f}ms max={ordered[-1] * 1000:.2f}ms")
@@ -0,0 +1,93 @@
+"""Measure edit journal write overhead and time-travel latency as history grows.
+
+    python tools/bench_journal.py --rows 50000 --events 20000
+
+Write overhead: add_entry and update_entry_fields are timed with the
+journal triggers in place, then with them dropped (change_log triggers
+stay in both runs).
+
+Time travel: two weeks receive the same stream of edits. One is
+snapshotted every EditJournal.SNAPSHOT_EVERY events, as the app does,
+and the other keeps only its baseline snapshot. week_as_of is timed for
+both as the journal grows.
+"""
+import os
+import argparse
+import random
+from datetime import datetime
+
+from bench_common import temp_dir, build_database, open_manager, timed, summarize
+from edit_journal import EditJournal
+
+def time_writes(db_manager, samples, rng):
+    inserts = [timed(db_manager.add_entry, '2026-01-05', 'Monday', '9999', 'BENCH', 1.0, 'Support', '')[0]
+               for _ in range(samples)]
+    max_id = db_manager.conn.execute('SELECT MAX(id) FROM time_entries').fetchone()[0]
+    updates = [timed(db_manager.update_entry_fields, rng.randint(1, max_id), {'hours': rng.randint(1, 32) / 4})[0]
+               for _ in range(samples)]
+    return inserts, updates
+
+def week_ids(db_manager, week_start, week_end):
+    return [row[0] for row in db_manager.get_entries_for_week(week_start, week_end)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--samples', type=int, default=500)
+    parser.add_argument('--events', type=int, default=20000)
+    parser.add_argument('--checkpoints', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    folder = temp_dir()
+    db_path = os.path.join(folder, 'timesheet.db')
+    build_database(db_path, args.rows)
+    db_manager = open_manager(db_path)
+    journal = EditJournal(db_manager)
+    rng = random.Random(3)
+    print(f"Database: {args.rows} rows")
+
+    inserts, updates = time_writes(db_manager, args.samples, rng)
+    print(f"add_entry, journal on:            {summarize(inserts)}")
+    print(f"update_entry_fields, journal on:  {summarize(updates)}")
+    with db_manager.conn:
+        for op in ('insert', 'update', 'delete'):
+            db_manager.conn.execute(f'DROP TRIGGER entry_journal_{op}')
+    inserts, updates = time_writes(db_manager, args.samples, rng)
+    print(f"add_entry, journal off:           {summarize(inserts)}")
+    print(f"update_entry_fields, journal off: {summarize(updates)}")
+    # Reconnecting recreates the triggers and snapshots every week at a new start marker
+    db_manager.try_connect()
+
+    snapshotted = ('2020-06-01', '2020-06-07')
+    replayed = ('2020-06-08', '2020-06-14')
+    ids = {week: week_ids(db_manager, *week) for week in (snapshotted, replayed)}
+    print(f"Time travel on weeks of {len(ids[snapshotted])} and {len(ids[replayed])} entries")
+
+    step = max(1, args.events // args.checkpoints)
+    done = 0
+    while done < args.events:
+        for i in range(step):
+            for week in (snapshotted, replayed):
+                db_manager.update_entry_fields(rng.choice(ids[week]), {'hours': rng.randint(1, 32) / 4})
+            if (done + i + 1) % journal.SNAPSHOT_EVERY == 0:
+                db_manager.snapshot_week(*snapshotted)
+        done += step
+
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        results = {}
+        for week in (snapshotted, replayed):
+            samples = [timed(journal.week_as_of, week[0], now) for _ in range(args.repeat)]
+            current = sorted((row[0], row[3]) for row in db_manager.get_entries_for_week(*week))
+            matches = sorted((entry.id, entry.hours) for entry in samples[-1][1]) == current
+            results[week] = (summarize([seconds for seconds, _ in samples]), matches)
+        journal_rows = db_manager.conn.execute('SELECT MAX(seq) FROM entry_journal').fetchone()[0]
+        print(f"{journal_rows} journal rows, {done} edits per week:")
+        print(f"  snapshot every {journal.SNAPSHOT_EVERY}: {results[snapshotted][0]} "
+              f"{'ok' if results[snapshotted][1] else 'MISMATCH'}")
+        print(f"  baseline only:     {results[replayed][0]} {'ok' if results[replayed][1] else 'MISMATCH'}")
+
+    print(f"Database size: {os.path.getsize(db_path) / 1e6:.1f} MB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Time ReportBuilder with 1..N worker processes on a synthetic database.
+
+    python tools/bench_reports.py --rows 2000000 --max-workers 8
+
+Each worker count gets a fresh ReportBuilder. The first build includes
+starting the worker pool; the following builds reuse it. All results are
+checked against the single-process build.
+"""
+import os
+import argparse
+
+from bench_common import temp_dir, build_database, open_manager, timed, summarize
+from report_builder import ReportBuilder
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--start', default='2016-01-01')
+    parser.add_argument('--end', default='2025-12-31')
+    parser.add_argument('--group-by', default='project,month')
+    args = parser.parse_args()
+    group_by = tuple(args.group_by.split(','))
+
+    folder = temp_dir()
+    db_path = os.path.join(folder, 'timesheet.db')
+    seconds, _ = timed(build_database, db_path, args.rows)
+    db_manager = open_manager(db_path)
+    print(f"Database: {args.rows} rows, {os.path.getsize(db_path) / 1e6:.1f} MB, built in {seconds:.1f}s")
+    print(f"Report: {args.start}..{args.end} grouped by {', '.join(group_by)}; "
+          f"{os.cpu_count()} CPUs reported")
+
+    expected = None
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        builder = ReportBuilder(db_manager, max_workers=workers)
+        try:
+            first, result = timed(builder.build, args.start, args.end, group_by)
+            warm = [timed(builder.build, args.start, args.end, group_by)[0] for _ in range(args.repeat)]
+        finally:
+            builder.close()
+        if expected is None:
+            expected = result
+        mean = sum(warm) / len(warm)
+        baseline = baseline or mean
+        print(f"workers={workers}: first={first:.2f}s  warm {summarize(warm)}  "
+              f"speedup={baseline / mean:.2f}x  {'ok' if result == expected else 'MISMATCH'}")
+
+if __name__ == '__main__':
+    main()